@@ -0,0 +1,204 @@
+# benchmarks/common.py  – throwaway database + result helpers shared by the suite
+"""Shared plumbing for the benchmark scripts.
+
+``create_app()`` reads ``DATABASE_URL`` when it runs and
+``reporting`` resolves ``reporting_config.yaml`` against the working
+directory, so :func:`load_app` points both at a scratch directory
+*before* building the app.  Nothing here touches ``instance/chores.db``
+or the real reporting config.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+INSERT_CHUNK = 5000
+
+
+# ---------------------------------------------------------------------------
+# app + seeded database
+# ---------------------------------------------------------------------------
+
+def load_app(workdir: Optional[Path] = None):
+    """Build the app against a fresh SQLite file in *workdir* (temp dir if None)."""
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="familyhub-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'bench.db'}"
+    for name in ("MAILGUN_API_KEY", "MAILGUN_DOMAIN"):
+        os.environ.pop(name, None)  # reports stay dry-run
+    sys.path.insert(0, str(REPO_ROOT))
+    os.chdir(workdir)
+
+    from familyhub import create_app  # noqa: E402 – must follow the env set-up above
+
+    return create_app(), workdir
+
+
+def seed(app, *, users: int, chores_per_user: int, years: float,
+         rotating_share: float = 0.2, seed_value: int = 1) -> Dict[str, int]:
+    """Create the schema and fill it with reproducible synthetic data.
+
+    Every user gets *chores_per_user* chores spread over the week; about
+    *rotating_share* of them rotate between three users.  History holds
+    one snapshot per Monday going back *years*, with completion rates
+    that differ per user so reports and stats have something to show.
+    """
+    import yaml
+    from familyhub.extensions import db
+    from familyhub.models import Chore, ChoreHistory, ChoreRotation, User
+    from familyhub.scheduler import refresh_weekly_rollup
+
+    rng = random.Random(seed_value)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+
+        names = [f"user{n:03d}" for n in range(users)]
+        db.session.execute(db.insert(User), [{"username": n} for n in names])
+        user_ids = dict(db.session.execute(db.select(User.username, User.id)).all())
+
+        chores, rotations = [], []
+        chore_id = 0
+        for index, name in enumerate(names):
+            for n in range(chores_per_user):
+                chore_id += 1
+                rotating = users >= 3 and rng.random() < rotating_share
+                owner = user_ids[name]
+                chores.append({
+                    "id": chore_id,
+                    "description": f"Chore {n} of {name}",
+                    "completed": rng.random() < 0.5,
+                    "user_id": owner,
+                    "day": DAYS[n % 7],
+                    "rotation_type": "rotating" if rotating else "static",
+                    "base_user_id": owner if rotating else None,
+                })
+                if rotating:
+                    members = [owner] + [user_ids[names[(index + k) % users]] for k in (1, 2)]
+                    rotations += [{"chore_id": chore_id, "position": p, "user_id": u}
+                                  for p, u in enumerate(members)]
+        db.session.execute(db.insert(Chore), chores)
+        if rotations:
+            db.session.execute(db.insert(ChoreRotation), rotations)
+
+        owner_names = {uid: name for name, uid in user_ids.items()}
+        diligence = {uid: rng.uniform(0.3, 1.0) for uid in owner_names}
+        last_monday = date.today() - timedelta(days=date.today().weekday() + 7)
+        weeks = max(int(years * 52), 0)
+        history: List[Dict[str, Any]] = []
+        rows = 0
+        for week in range(weeks):
+            snapshot = last_monday - timedelta(weeks=week)
+            for chore in chores:
+                history.append({
+                    "chore_id": chore["id"],
+                    "username": owner_names[chore["user_id"]],
+                    "date": snapshot,
+                    "completed": rng.random() < diligence[chore["user_id"]],
+                    "day": chore["day"],
+                    "rotation_type": chore["rotation_type"],
+                })
+                if len(history) >= INSERT_CHUNK:
+                    db.session.execute(db.insert(ChoreHistory), history)
+                    rows += len(history)
+                    history.clear()
+        if history:
+            db.session.execute(db.insert(ChoreHistory), history)
+            rows += len(history)
+        refresh_weekly_rollup()
+        db.session.commit()
+
+    config = {name: {"email": f"{name}@example.test", "allowance": 10} for name in names}
+    with open("reporting_config.yaml", "w", encoding="utf-8") as fh:
+        yaml.dump(config, fh, sort_keys=True, default_flow_style=False)
+
+    return {"users": users, "chores": len(chores), "rotating": len({r["chore_id"] for r in rotations}),
+            "history_rows": rows, "weeks": weeks}
+
+
+# ---------------------------------------------------------------------------
+# timing + results
+# ---------------------------------------------------------------------------
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Milliseconds summary of a list of durations in seconds."""
+    ms = [s * 1000 for s in samples]
+    return {
+        "runs": len(ms),
+        "min_ms": round(min(ms), 3),
+        "median_ms": round(statistics.median(ms), 3),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "max_ms": round(max(ms), 3),
+    }
+
+
+def time_calls(fn: Callable[[], Any], *, repeat: int, warmup: int = 1) -> Dict[str, float]:
+    """Run *fn* ``warmup + repeat`` times (its prints swallowed) and summarise."""
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            fn()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(kind: str, payload: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """Write *payload* plus run metadata as JSON and return the path."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = Path(output) if output else RESULTS_DIR / f"{kind}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "kind": kind,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **payload,
+    }
+    path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    return path
+
+
+def add_seed_arguments(parser) -> None:
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--chores-per-user", type=int, default=15)
+    parser.add_argument("--years", type=float, default=2.0, help="years of weekly history")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the data set")
+    parser.add_argument("--workdir", help="scratch directory (default: a new temp dir)")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/<kind>-<time>.json)")
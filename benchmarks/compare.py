@@ -0,0 +1,48 @@
+# benchmarks/compare.py  – diff two result files from micro.py or load.py
+"""Print median / p95 changes between two benchmark result files.
+
+    python benchmarks/compare.py results/micro-before.json results/micro-after.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+
+def _entries(document):
+    results = document["results"]
+    return results.get("per_path", results) if document["kind"] == "load" else results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before, encoding="utf-8") as fh:
+        before = json.load(fh)
+    with open(args.after, encoding="utf-8") as fh:
+        after = json.load(fh)
+    if before["kind"] != after["kind"]:
+        parser.error(f"cannot compare a {before['kind']} run with a {after['kind']} run")
+    if before.get("dataset") != after.get("dataset"):
+        print(f"warning: data sets differ ({before.get('dataset')} vs {after.get('dataset')})")
+
+    old, new = _entries(before), _entries(after)
+    width = max(map(len, old | new))
+    print(f"{'':<{width}}  {'median before':>13} {'after':>9} {'change':>8}   {'p95 before':>10} {'after':>9}")
+    for name in sorted(old | new):
+        if name not in old or name not in new:
+            print(f"{name:<{width}}  (only in {'after' if name in new else 'before'})")
+            continue
+        a, b = old[name], new[name]
+        change = (b["median_ms"] / a["median_ms"] - 1) * 100 if a["median_ms"] else 0.0
+        print(f"{name:<{width}}  {a['median_ms']:>13.3f} {b['median_ms']:>9.3f} {change:>+7.1f}%"
+              f"   {a['p95_ms']:>10.3f} {b['p95_ms']:>9.3f}")
+    if before["kind"] == "load":
+        print(f"throughput: {before['results']['throughput_rps']} → {after['results']['throughput_rps']} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# benchmarks/load.py  – concurrent HTTP load generator
+"""Hammer the HTTP API from several threads and record latency / throughput.
+
+Against a running server::
+
+    python benchmarks/load.py --url http://127.0.0.1:5000 --concurrency 16 --duration 30
+
+Without ``--url`` the app is seeded into a scratch database (same
+options as ``micro.py``) and served in-process by Werkzeug's threaded
+server on a free port, so runs are reproducible end to end.
+
+``--mix`` sets the request mix as ``path=weight`` pairs; ``write`` is a
+special path that toggles a random chore, so readers see ETag churn.
+Results go to ``benchmarks/results/load-<timestamp>.json``.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+import requests
+
+from common import add_seed_arguments, load_app, save_results, seed, summarize
+
+DEFAULT_MIX = "/chores=6,/archive?limit=100=2,/grocery=1,/stats/weekly=1,write=1"
+
+
+def parse_mix(raw: str) -> List[Tuple[str, int]]:
+    mix = []
+    for part in raw.split(","):
+        path, _, weight = part.rpartition("=")
+        mix.append((path, int(weight)))
+    return mix
+
+
+def serve_in_process(app):
+    """Start the app on 127.0.0.1:<free port> in a daemon thread; return its URL."""
+    from werkzeug.serving import make_server
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)  # no per-request access log
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def worker(base_url: str, mix, chore_ids, deadline: float, seed_value: int,
+           samples: Dict[str, List[float]], statuses: Counter, lock: threading.Lock) -> None:
+    rng = random.Random(seed_value)
+    paths, weights = zip(*mix)
+    local_samples: Dict[str, List[float]] = defaultdict(list)
+    local_statuses: Counter = Counter()
+    with requests.Session() as session:
+        while time.perf_counter() < deadline:
+            path = rng.choices(paths, weights)[0]
+            start = time.perf_counter()
+            try:
+                if path == "write":
+                    resp = session.post(f"{base_url}/chores/{rng.choice(chore_ids)}/toggle", timeout=30)
+                else:
+                    resp = session.get(f"{base_url}{path}", timeout=30)
+                local_statuses[str(resp.status_code)] += 1
+            except requests.RequestException as exc:
+                local_statuses[type(exc).__name__] += 1
+                continue
+            local_samples[path].append(time.perf_counter() - start)
+    with lock:
+        for path, values in local_samples.items():
+            samples[path].extend(values)
+        statuses.update(local_statuses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_seed_arguments(parser)
+    parser.add_argument("--url", help="target server (default: seed and serve in-process)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    dataset = None
+    if args.url:
+        base_url = args.url.rstrip("/")
+    else:
+        app, workdir = load_app(args.workdir)
+        dataset = seed(app, users=args.users, chores_per_user=args.chores_per_user,
+                       years=args.years, seed_value=args.seed)
+        print(f"seeded {workdir}: {dataset}")
+        base_url, _server = serve_in_process(app)
+    chore_ids = [c["id"] for c in requests.get(f"{base_url}/chores", timeout=30).json()] or [1]
+
+    mix = parse_mix(args.mix)
+    samples: Dict[str, List[float]] = defaultdict(list)
+    statuses: Counter = Counter()
+    lock = threading.Lock()
+    print(f"{args.concurrency} worker(s) for {args.duration:g}s against {base_url}")
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(base_url, mix, chore_ids, deadline,
+                                              args.seed + n, samples, statuses, lock))
+        for n in range(args.concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in samples.values())
+    everything = [s for values in samples.values() for s in values]
+    results = {
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "statuses": dict(statuses),
+        "overall": summarize(everything) if everything else {},
+        "per_path": {path: summarize(values) for path, values in sorted(samples.items())},
+    }
+    print(f"{total} requests, {results['throughput_rps']} req/s, statuses {dict(statuses)}")
+    for path, summary in results["per_path"].items():
+        print(f"  {path:<22} median {summary['median_ms']:>8.2f} ms   p95 {summary['p95_ms']:>8.2f} ms")
+
+    path = save_results("load", {
+        "target": base_url if args.url else "in-process",
+        "dataset": dataset, "seed": args.seed, "concurrency": args.concurrency,
+        "duration_s": args.duration, "mix": args.mix, "results": results,
+    }, output)
+    print(f"results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
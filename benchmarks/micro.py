@@ -0,0 +1,91 @@
+# benchmarks/micro.py  – micro-benchmarks of the hot paths on a seeded database
+"""Time the hot paths against a reproducible synthetic data set.
+
+    python benchmarks/micro.py --users 5 --chores-per-user 15 --years 2
+    python benchmarks/micro.py --users 50 --years 5 --repeat 50
+
+Each benchmark runs ``--repeat`` times after one warm-up call; results
+(min / median / mean / p95 / max in ms, plus the data-set size) are
+written to ``benchmarks/results/micro-<timestamp>.json``.  Runs with the
+same arguments and ``--seed`` use identical data, so two result files
+can be compared before and after a change.
+
+Writes (``weekly_archive_task``, ``rotate_chores_once``) are measured on
+the scratch database only; reports are dry-run – they are queued in the
+outbox but no worker runs.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+
+from common import add_seed_arguments, load_app, save_results, seed, time_calls
+
+
+def run(app, repeat: int):
+    from familyhub.extensions import db, read_snapshot
+    from familyhub.models import EmailOutbox
+    from familyhub.reporting import generate_weekly_reports
+    from familyhub.scheduler import rotate_chores_once, weekly_archive_task
+
+    client = app.test_client()
+    results = {}
+
+    results["get_chores"] = time_calls(lambda: client.get("/chores"), repeat=repeat)
+    results["get_archive_first_page"] = time_calls(
+        lambda: client.get("/archive?limit=100"), repeat=repeat)
+    results["get_archive_user_filter"] = time_calls(
+        lambda: client.get("/archive?username=user000&limit=100"), repeat=repeat)
+    results["reports_preview"] = time_calls(lambda: client.get("/reports/preview"), repeat=repeat)
+    results["stats_weekly"] = time_calls(lambda: client.get("/stats/weekly?weeks=52"), repeat=repeat)
+
+    def rotate():
+        with app.app_context():
+            rotate_chores_once()
+            db.session.rollback()  # measure the rotation, keep the data set fixed
+
+    results["rotate_chores_once"] = time_calls(rotate, repeat=repeat)
+
+    def reports():
+        with app.app_context():
+            with read_snapshot() as session:
+                generate_weekly_reports(session)
+            db.session.execute(db.delete(EmailOutbox))
+            db.session.commit()
+
+    results["generate_weekly_reports"] = time_calls(reports, repeat=repeat)
+
+    def archive():
+        with app.app_context():
+            weekly_archive_task(send_reports=False, force=True)
+
+    # upserts today's snapshot each time, so every run does the same work
+    results["weekly_archive_task"] = time_calls(archive, repeat=repeat)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_seed_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    app, workdir = load_app(args.workdir)
+    dataset = seed(app, users=args.users, chores_per_user=args.chores_per_user,
+                   years=args.years, seed_value=args.seed)
+    print(f"seeded {workdir}: {dataset}")
+
+    results = run(app, args.repeat)
+    width = max(map(len, results))
+    for name, summary in results.items():
+        print(f"{name:<{width}}  median {summary['median_ms']:>9.3f} ms   p95 {summary['p95_ms']:>9.3f} ms")
+
+    path = save_results("micro", {
+        "dataset": dataset, "seed": args.seed, "repeat": args.repeat, "results": results,
+    }, output)
+    print(f"results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
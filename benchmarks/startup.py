@@ -0,0 +1,131 @@
+# benchmarks/startup.py  – cold-start import budget, measured with python -X importtime
+"""Fail when building the app imports more than its start-up budget allows.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --repeat 15 --scale 1.5   # noisy machine
+
+Each scenario runs in a fresh interpreter under ``-X importtime``; its
+import time is the sum of the top-level cumulative entries after
+interpreter start-up (``site`` and its ``.pth`` files are not counted).
+Flask + Flask-SQLAlchemy alone are measured in the same rounds as the
+*baseline*, and the budget applies to the median time a scenario adds on
+top of it, so the check means the same on a fast laptop and a slow CI
+box.  It fails (exit status 1) when a median goes over
+``budget_ms × --scale`` or when a module that must stay lazy was
+imported at all.  Results are written like the other benchmarks, so
+``compare.py`` can diff two runs.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+from common import REPO_ROOT, save_results, summarize
+
+BASELINE = "import flask, flask_sqlalchemy, sqlalchemy.orm"
+
+# imported on first use only; none of them may load while an app is built
+ALWAYS_LAZY = ("flask_apscheduler", "apscheduler", "flask_migrate", "alembic",
+               "requests", "yaml", "dotenv")
+
+# name -> (code, budget in ms over BASELINE, modules that must not be imported)
+SCENARIOS: Dict[str, Tuple[str, float, Tuple[str, ...]]] = {
+    # what every gunicorn worker and `import familyhub` callers pay
+    "web_app": (
+        "from familyhub import create_app; create_app()",
+        120, ALWAYS_LAZY,
+    ),
+    # `python reporting.py sync|report` before it touches the database
+    "reporting_cli": (
+        "import familyhub.reporting; from familyhub import create_app; create_app(web=False)",
+        100, ALWAYS_LAZY + ("familyhub.routes", "familyhub.assets", "familyhub.compression",
+                       "familyhub.fastjson"),
+    ),
+}
+
+
+def measure(code: str, env: Dict[str, str]) -> Tuple[float, Dict[str, int]]:
+    """Run *code* once; return (import seconds, {module: cumulative µs})."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=REPO_ROOT,
+                          env=env, capture_output=True, text=True)
+    if proc.returncode:
+        raise SystemExit(f"{code!r} failed:\n{proc.stderr[-2000:]}")
+
+    modules: Dict[str, int] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        top_level = not name[1:].startswith(" ")  # nested imports are indented
+        if top_level and name.strip() == "site":
+            modules, total = {}, 0  # everything so far was interpreter start-up
+            continue
+        modules[name.strip()] = int(cumulative)
+        if top_level:
+            total += int(cumulative)
+    return total / 1e6, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    parser.add_argument("--output", help="result file (default: benchmarks/results/startup-<time>.json)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("FLASK_RUN_FROM_CLI", None)  # would pull in Flask-Migrate
+    env["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp(prefix='familyhub-startup-')}/startup.db"
+
+    codes = {"baseline": BASELINE, **{name: code for name, (code, _, _) in SCENARIOS.items()}}
+    samples: Dict[str, List[float]] = {name: [] for name in codes}
+    modules: Dict[str, Dict[str, int]] = {}
+    for code in codes.values():
+        measure(code, env)  # warm-up: writes the .pyc files
+    for _ in range(args.repeat):
+        # interleaved, so load changes on the machine hit every scenario alike
+        for name, code in codes.items():
+            seconds, modules[name] = measure(code, env)
+            samples[name].append(seconds)
+
+    results = {name: summarize(values) for name, values in samples.items()}
+    baseline = results["baseline"]["median_ms"]
+    print(f"{'baseline':<14} median {baseline:>7.1f} ms  (flask + flask_sqlalchemy)")
+    failures = []
+    for name, (_, budget, lazy) in SCENARIOS.items():
+        budget *= args.scale
+        overhead = round(results[name]["median_ms"] - baseline, 3)
+        loaded = sorted({m if m in lazy else m.split(".")[0]
+                         for m in modules[name] if m in lazy or m.split(".")[0] in lazy})
+        results[name].update(overhead_ms=overhead, budget_ms=budget, eagerly_imported=loaded)
+
+        verdict = "ok"
+        if overhead > budget:
+            verdict = "OVER BUDGET"
+        if loaded:
+            verdict = "EAGER IMPORTS"
+        print(f"{name:<14} median {results[name]['median_ms']:>7.1f} ms  "
+              f"{overhead:+.1f} ms over baseline (budget {budget:.0f} ms)  {verdict}")
+        if verdict == "ok":
+            continue
+        failures.append(name)
+        if loaded:
+            print(f"  should be lazy: {', '.join(loaded)}")
+        heaviest = sorted(((us, m) for m, us in modules[name].items() if "." not in m), reverse=True)
+        print("  heaviest packages: " + ", ".join(f"{m} {us / 1000:.0f} ms" for us, m in heaviest[:8]))
+
+    path = save_results("startup", {"repeat": args.repeat, "scale": args.scale,
+                                    "results": results}, args.output)
+    print(f"results written to {path}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
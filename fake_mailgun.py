@@ -0,0 +1,112 @@
+# fake_mailgun.py  – local stand-in for the Mailgun messages API
+"""Tiny Mailgun look-alike for exercising the e-mail outbox locally.
+
+Run it, then point the app at it::
+
+    python fake_mailgun.py --port 8025 --fail-first 2
+    MAILGUN_BASE_URL=http://127.0.0.1:8025 MAILGUN_API_KEY=test \
+        MAILGUN_DOMAIN=example.test python Family_Hub1_0.py
+
+Every ``POST /v3/<domain>/messages`` is printed (and appended to
+``--log`` as JSON lines).  Batch sends are expanded the way Mailgun
+does it: one rendered text per recipient, with ``%recipient.<name>%``
+placeholders filled from ``recipient-variables``.  ``--fail-first N``
+answers the first N requests with 503 and ``--delay`` slows every
+response down, which covers the retry/backoff and slow-provider paths.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def render_batch(record: dict) -> dict:
+    """Return ``{recipient: text}`` with recipient variables substituted."""
+    variables = json.loads(record.get("recipient-variables") or "{}")
+    rendered = {}
+    for to in record.get("to", []):
+        values = variables.get(to, {})
+        rendered[to] = re.sub(r"%recipient\.(\w+)%",
+                              lambda m: str(values.get(m.group(1), "")), record.get("text", ""))
+    return rendered
+
+
+class _State:
+    def __init__(self, fail_first: int, delay: float, log_path: str | None) -> None:
+        self.remaining_failures = fail_first
+        self.delay = delay
+        self.log_path = log_path
+        self.lock = threading.Lock()
+        self.received = 0
+
+
+def _make_handler(state: _State):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802 – http.server naming
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            if state.delay:
+                time.sleep(state.delay)
+
+            if not (self.path.startswith("/v3/") and self.path.endswith("/messages")):
+                return self._reply(404, {"message": "not found"})
+
+            with state.lock:
+                if state.remaining_failures > 0:
+                    state.remaining_failures -= 1
+                    return self._reply(503, {"message": "temporarily unavailable"})
+                state.received += 1
+                count = state.received
+
+            record = {k: v if len(v) > 1 or k == "to" else v[0] for k, v in form.items()}
+            print(f"[fake-mailgun] #{count} {self.path} to={record.get('to')} "
+                  f"subject={record.get('subject')!r}")
+            if "recipient-variables" in record:
+                record["rendered"] = render_batch(record)
+                print(f"[fake-mailgun]   batch of {len(record['rendered'])} recipient(s)")
+            if state.log_path:
+                with state.lock, open(state.log_path, "a", encoding="utf-8") as fh:
+                    fh.write(json.dumps({"path": self.path, **record}) + "\n")
+            self._reply(200, {"id": f"<{uuid.uuid4()}@fake-mailgun>", "message": "Queued. Thank you."})
+
+        def _reply(self, status: int, body: dict) -> None:
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args) -> None:  # quieter than the default access log
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-first", type=int, default=0,
+                        help="answer the first N requests with 503")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="seconds to wait before every response")
+    parser.add_argument("--log", help="append received messages to this JSONL file")
+    args = parser.parse_args()
+
+    state = _State(args.fail_first, args.delay, args.log)
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), _make_handler(state))
+    print(f"fake Mailgun listening on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# familyhub/__init__.py  – application factory
+"""Family Hub: chores, rotation, groceries and weekly reports.
+
+``create_app()`` builds a configured app, ``upgrade_db(app)`` migrates
+the database once per deployment and ``start(app)`` launches the
+background services of a serving process (scheduler election, outbox
+workers).  Importing the package is cheap: heavy dependencies
+(APScheduler, Flask-Migrate/Alembic, requests, PyYAML, python-dotenv)
+are imported where they are first used, and
+``benchmarks/startup.py`` keeps it that way.
+
+    config       settings from the environment (+ ``.env`` via load_env)
+    extensions   the ``db`` handle, SQLite pragmas, read_snapshot()
+    models       tables and the board version / change feed helpers
+    scheduler    archive, rollups, rotation, cron jobs and their CLI
+    reporting    reporting_config.yaml, allowances, weekly report mails
+    outbox       durable e-mail outbox and its delivery worker pool
+    leader       file-lock election of the one scheduler process
+    routes       the HTTP API (one blueprint)
+    metrics      request / SQL / job instrumentation behind /metrics
+    compression  gzip / brotli for dynamic responses
+    fastjson     the orjson JSON provider
+    assets       fingerprinted static files, vendored front-end code
+"""
+import importlib
+import os
+from pathlib import Path
+
+from flask import Flask
+
+from . import config, extensions
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _flask_cli() -> bool:
+    # set by the `flask` command before it loads the app
+    return os.environ.get("FLASK_RUN_FROM_CLI") == "true"
+
+
+def create_app(*, web: bool = True) -> Flask:
+    """Build the app.  ``web=False`` leaves out the routes and HTTP hooks.
+
+    ``flask db …`` gets Flask-Migrate; servers and scripts never import it.
+    """
+    app = Flask(__name__, static_folder=str(ROOT / "static"),
+                template_folder=str(ROOT / "templates"))
+    config.init_app(app)
+    extensions.init_app(app)
+
+    importlib.import_module(f"{__name__}.models")  # the model classes fill db.metadata
+    from . import scheduler
+
+    scheduler.init_app(app)
+    if _flask_cli():
+        from flask_migrate import Migrate
+
+        Migrate(app, extensions.db)
+
+    if web:
+        from . import assets, compression, fastjson, metrics, routes
+
+        app.register_blueprint(routes.bp)
+        with app.app_context():
+            metrics.init_app(app, extensions.db.engine)
+        fastjson.init_app(app)
+        compression.init_app(app)  # registered after metrics, so sizes are as sent
+        assets.init_app(app)
+    return app
+
+
+def upgrade_db(app: Flask) -> Flask:
+    """Migrate the database to the latest revision and sync the report config.
+
+    Run once per deployment, *before* any worker starts:
+    ``gunicorn.conf.py`` does it in the master's ``on_starting`` hook and
+    ``python Family_Hub1_0.py`` before the dev server; ``flask db upgrade``
+    does the schema part by hand.
+    """
+    from flask_migrate import Migrate, upgrade
+    from .reporting import sync_config
+
+    if "migrate" not in app.extensions:
+        Migrate(app, extensions.db, directory=str(ROOT / "migrations"))
+    with app.app_context():
+        upgrade()
+        sync_config(extensions.db.session)
+        extensions.db.engine.dispose()  # forked workers open their own
+    return app
+
+
+def _check_schema(app: Flask) -> None:
+    """Refuse to serve a database that is not at the migrations head."""
+    from alembic.script import ScriptDirectory
+    from sqlalchemy import inspect
+
+    heads = set(ScriptDirectory(str(ROOT / "migrations")).get_heads())
+    with app.app_context(), extensions.db.engine.connect() as conn:
+        current = set()
+        if inspect(conn).has_table("alembic_version"):
+            current = set(conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalars())
+    if current != heads:
+        raise RuntimeError(
+            f"database is at revision {', '.join(sorted(current)) or '(none)'} but the "
+            f"migrations head is {', '.join(sorted(heads))}; run `flask db upgrade` "
+            f"(gunicorn.conf.py does this before starting workers)"
+        )
+
+
+def start(app: Flask) -> Flask:
+    """Prepare this process to serve *app* (once per app).
+
+    Every worker process runs the outbox pool (claims are atomic, so
+    workers never send the same row twice) and shares its metrics with
+    the others (see :mod:`metrics`); the cron jobs run only in
+    the elected leader, see :func:`familyhub.scheduler.start`.  The
+    schema is never created here – that would race between workers – so
+    :func:`upgrade_db` must have run; a stale database is refused.
+    ``wsgi.py`` calls this for gunicorn; ``python Family_Hub1_0.py`` for
+    the dev server.
+    """
+    if "outbox_worker" in app.extensions:
+        return app
+
+    from . import metrics, scheduler
+    from .outbox import OutboxWorker
+
+    _check_schema(app)
+    metrics.start_export(app.config["METRICS_DIR"], app.config["METRICS_EXPORT_SECONDS"])
+    scheduler.start(app)
+    app.extensions["outbox_worker"] = OutboxWorker(app, threads=app.config["OUTBOX_WORKERS"])
+    app.extensions["outbox_worker"].start()
+    return app
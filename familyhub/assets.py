@@ -0,0 +1,339 @@
+# familyhub/assets.py  – content-hashed, precompressed static files
+"""Fingerprinted static assets.
+
+Build step (run by the Dockerfile; re-run after editing ``static/``)::
+
+    python -m familyhub.assets   # or: flask build-assets
+
+copies every file under ``static/`` to ``static/dist/`` as
+``<name>.<hash><ext>`` (first 10 hex digits of its SHA-256), writes
+``.gz`` – and ``.br`` when the ``brotli`` package is installed – next to
+each compressible one, and records ``{"style.css": "style.1a2b3c4d5e.css"}``
+in ``static/dist/manifest.json``.
+
+At run time :func:`init_app` loads the manifest and
+
+* rewrites ``url_for('static', filename=...)`` to the hashed name, so
+  templates keep using plain names and every content change gets a new
+  URL – no more hand-edited ``?v=`` query strings;
+* serves ``/static/dist/…`` with ``Cache-Control: immutable`` and a
+  year's max-age, picking the ``.br``/``.gz`` sibling the browser
+  accepts, so repeat page loads only fetch the HTML.
+
+Without a manifest (a fresh checkout), and under the debug server,
+everything falls back to the plain ``/static/<file>`` URLs.
+
+Third-party front-end code is committed in ``static/vendor/`` so the
+dashboard needs no CDN and works on a LAN-only network.  To bump a pin,
+edit ``VENDOR_FILES`` / ``GOOGLE_FONTS`` and their entries in
+``vendor.lock.json``, then::
+
+    python -m familyhub.assets vendor            # needs internet, fonttools and brotli
+    python -m familyhub.assets vendor --from DIR # same, from local copies laid out as in the lock
+
+fetches the pinned SortableJS build and the Poppins weights we use,
+subsets the fonts to Latin + the punctuation and symbols found in our
+templates/scripts, and writes them as WOFF2 with a matching
+``poppins.css``.  Every file is checked against the sha256 recorded for
+its URL in ``vendor.lock.json``, whether downloaded or taken from
+``--from``; a file without a recorded hash is refused, nothing is
+trusted on first use.  Take the hashes from the publisher when adding
+or bumping an entry, never from your own download.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib.util
+import json
+import mimetypes
+import posixpath
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from flask import abort, request, send_from_directory
+
+from . import compression
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT / "static"
+DIST_NAME = "dist"
+MANIFEST_NAME = "manifest.json"
+HASH_LENGTH = 10
+IMMUTABLE = "public, max-age=31536000, immutable"
+PRECOMPRESS_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map"}
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+CSS_URL = re.compile(r"""url\((['"]?)([^'")]+)\1\)""")
+
+mimetypes.add_type("font/woff2", ".woff2")
+
+
+# ---------------------------------------------------------------------------
+# build
+# ---------------------------------------------------------------------------
+
+def _hashed_name(relative: Path, data: bytes) -> str:
+    digest = hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+    return relative.with_name(f"{relative.stem}.{digest}{relative.suffix}").as_posix()
+
+
+def _rewrite_css_urls(relative: Path, data: bytes, manifest: Dict[str, str]) -> bytes:
+    """Point relative ``url(...)`` references at the fingerprinted files."""
+    base = posixpath.dirname(relative.as_posix())
+
+    def replace(match):
+        quote, target = match.groups()
+        if re.match(r"^(?:[a-z]+:|/|#)", target):
+            return match.group(0)  # data:, http(s):, absolute and fragment URLs
+        path, _, suffix = target.partition("?")
+        hashed = manifest.get(posixpath.normpath(posixpath.join(base, path)))
+        if hashed is None:
+            return match.group(0)
+        new = posixpath.relpath(hashed, base or ".") + (f"?{suffix}" if suffix else "")
+        return f"url({quote}{new}{quote})"
+
+    return CSS_URL.sub(replace, data.decode("utf-8")).encode("utf-8")
+
+
+def build(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    """Rebuild ``static/dist`` from scratch and return the manifest."""
+    dist = static_dir / DIST_NAME
+    if dist.exists():
+        shutil.rmtree(dist)
+
+    sources = [
+        source for source in sorted(static_dir.rglob("*"))
+        if source.is_file()
+        and source.relative_to(static_dir).parts[0] != DIST_NAME
+        and not source.name.startswith(".")
+    ]
+    manifest: Dict[str, str] = {}
+    # stylesheets last, so their url(...) references can be rewritten first
+    for source in sorted(sources, key=lambda p: p.suffix == ".css"):
+        relative = source.relative_to(static_dir)
+        data = source.read_bytes()
+        if source.suffix == ".css":
+            data = _rewrite_css_urls(relative, data, manifest)
+        hashed = _hashed_name(relative, data)
+        target = dist / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(data)
+        if source.suffix in PRECOMPRESS_SUFFIXES:
+            # mtime=0 keeps the .gz byte-identical between builds
+            target.with_name(target.name + ".gz").write_bytes(
+                gzip.compress(data, compresslevel=9, mtime=0))
+            if compression.brotli is not None:
+                target.with_name(target.name + ".br").write_bytes(
+                    compression.brotli.compress(data, quality=11))
+        manifest[relative.as_posix()] = hashed
+
+    (dist / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                                      encoding="utf-8")
+    return manifest
+
+
+# ---------------------------------------------------------------------------
+# vendored front-end dependencies
+# ---------------------------------------------------------------------------
+
+VENDOR_DIR = "vendor"
+VENDOR_LOCK = ROOT / "vendor.lock.json"
+CDN = "https://cdn.jsdelivr.net/npm"
+GOOGLE_FONTS = ("https://raw.githubusercontent.com/google/fonts/"
+                "8b0a1d0f5983c89bc2b93f1b5fb55f9e252744b5/ofl/poppins")
+
+# vendor/<path> -> pinned download (Sortable.min.js carries its MIT banner)
+VENDOR_FILES = {
+    "sortablejs/Sortable.min.js": f"{CDN}/sortablejs@1.15.0/Sortable.min.js",
+    "poppins/OFL.txt": f"{GOOGLE_FONTS}/OFL.txt",
+}
+POPPINS_WEIGHTS = {400: "Regular", 500: "Medium", 600: "SemiBold", 700: "Bold"}
+# Latin-1 plus common punctuation and the currency sign; user-entered
+# chore names and grocery items render in Poppins, so keep the whole block
+FONT_UNICODES = ("U+0020-007E", "U+00A0-00FF", "U+2010-2027", "U+2030-203A", "U+20AC", "U+2122")
+FONT_TEXT_SOURCES = ("templates/*.html", "static/*.js", "static/*.css")
+
+
+def _download(url: str) -> bytes:
+    import urllib.request  # build/vendor time only, never in the web app
+
+    with urllib.request.urlopen(url, timeout=60) as resp:  # noqa: S310 – pinned https URLs
+        return resp.read()
+
+
+def _font_sources() -> Iterable[Tuple[str, str]]:
+    for style in POPPINS_WEIGHTS.values():
+        yield f"poppins/Poppins-{style}.ttf", f"{GOOGLE_FONTS}/Poppins-{style}.ttf"
+
+
+def _load_lock() -> Dict[str, Dict[str, Optional[str]]]:
+    """``vendor.lock.json``; refuse to start while any download lacks a hash."""
+    lock = json.loads(VENDOR_LOCK.read_text(encoding="utf-8")) if VENDOR_LOCK.exists() else {}
+    wanted = {**VENDOR_FILES, **{name: url for name, url in _font_sources()}}
+    missing = [name for name, url in wanted.items()
+               if (lock.get(name) or {}).get("url") != url or not lock[name].get("sha256")]
+    if missing:
+        raise SystemExit(f"{VENDOR_LOCK.name} has no published sha256 for: {', '.join(missing)}\n"
+                         "record the publisher's hash for each URL before vendoring")
+    return lock
+
+
+def _verified(name: str, url: str, lock: Dict[str, Dict[str, Optional[str]]],
+              source_dir: Optional[Path] = None) -> bytes:
+    """Fetch *name* (from *url*, or ``source_dir/name``) and check its pinned sha256."""
+    origin = url if source_dir is None else str(source_dir / name)
+    data = _download(url) if source_dir is None else (source_dir / name).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != lock[name]["sha256"]:
+        raise SystemExit(f"{name}: {origin} has sha256 {digest}, "
+                         f"{VENDOR_LOCK.name} expects {lock[name]['sha256']}")
+    return data
+
+
+def _parse_ranges(ranges: Iterable[str]) -> set:
+    codepoints = set()
+    for item in ranges:
+        start, _, end = item[2:].partition("-")
+        codepoints.update(range(int(start, 16), int(end or start, 16) + 1))
+    return codepoints
+
+
+def _used_codepoints(root: Path) -> set:
+    """Every non-ASCII character that appears in our own templates/scripts."""
+    used = set()
+    for pattern in FONT_TEXT_SOURCES:
+        for path in root.glob(pattern):
+            used.update(ord(ch) for ch in path.read_text(encoding="utf-8") if ord(ch) > 0x7E)
+    return used
+
+
+def vendor(static_dir: Path = STATIC_DIR, source_dir: Optional[Path] = None) -> None:
+    """Fetch and subset the third-party files into ``static/vendor/``.
+
+    With *source_dir* the pinned files are read from there instead of
+    being downloaded; the hashes are checked all the same.
+    """
+    # fontTools writes WOFF2 through brotli, but only imports it when saving
+    missing = [name for name in ("fontTools", "brotli") if importlib.util.find_spec(name) is None]
+    if missing:
+        raise SystemExit(f"vendoring needs fonttools and brotli (missing: {', '.join(missing)}); "
+                         "pip install fonttools brotli")
+    from fontTools import subset
+
+    lock = _load_lock()
+    target = static_dir / VENDOR_DIR
+    for name, url in VENDOR_FILES.items():
+        path = target / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(_verified(name, url, lock, source_dir))
+        print(f"vendor/{name}  ←  {url}")
+
+    codepoints = _parse_ranges(FONT_UNICODES) | _used_codepoints(static_dir.parent)
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["kern", "liga", "calt", "ccmp", "locl", "mark", "mkmk"]
+    options.hinting = False
+    options.desubroutinize = True
+    faces = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for weight, (name, url) in zip(POPPINS_WEIGHTS, _font_sources()):
+            source = Path(tmp) / Path(name).name
+            source.write_bytes(_verified(name, url, lock, source_dir))
+            font = subset.load_font(str(source), options)
+            subsetter = subset.Subsetter(options)
+            subsetter.populate(unicodes=codepoints)
+            subsetter.subset(font)
+            out = target / "poppins" / f"poppins-{weight}.woff2"
+            subset.save_font(font, str(out), options)
+            print(f"vendor/poppins/{out.name}  ({out.stat().st_size // 1024} KiB, "
+                  f"{len(font.getBestCmap())} glyphs mapped)")
+            faces.append(
+                "@font-face {\n"
+                "  font-family: 'Poppins';\n"
+                "  font-style: normal;\n"
+                f"  font-weight: {weight};\n"
+                "  font-display: swap;\n"
+                f"  src: url(poppins-{weight}.woff2) format('woff2');\n"
+                "}\n"
+            )
+    (target / "poppins" / "poppins.css").write_text(
+        "/* Poppins (SIL OFL 1.1, see OFL.txt), subset by `python -m familyhub.assets vendor` */\n"
+        + "\n".join(faces), encoding="utf-8")
+
+
+def load_manifest(static_dir: Path = STATIC_DIR) -> Dict[str, str]:
+    try:
+        return json.loads((static_dir / DIST_NAME / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+# ---------------------------------------------------------------------------
+# Flask integration
+# ---------------------------------------------------------------------------
+
+def init_app(app) -> None:
+    static_dir = Path(app.static_folder)
+    dist = static_dir / DIST_NAME
+    app.extensions["asset_manifest"] = load_manifest(static_dir)
+
+    @app.url_defaults
+    def _hashed_static_url(endpoint, values):
+        # the debug server serves live files so edits show up without a rebuild
+        if endpoint == "static" and "filename" in values and not app.debug:
+            hashed = app.extensions["asset_manifest"].get(values["filename"])
+            if hashed:
+                values["filename"] = f"{DIST_NAME}/{hashed}"
+
+    @app.route(f"{app.static_url_path}/{DIST_NAME}/<path:filename>")
+    def hashed_static(filename):
+        if filename == MANIFEST_NAME or filename.endswith((".gz", ".br")):
+            abort(404)
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        available = [c for c, suffix in ENCODING_SUFFIXES.items()
+                     if (dist / (filename + suffix)).is_file()]
+        coding = compression.negotiate(request.headers.get("Accept-Encoding"), available)
+        served = filename + ENCODING_SUFFIXES[coding] if coding else filename
+
+        response = send_from_directory(dist, served, mimetype=mimetype, max_age=31536000)
+        if coding:
+            response.headers["Content-Encoding"] = coding
+        if available:
+            response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = IMMUTABLE
+        return response
+
+    @app.cli.command("build-assets")
+    def build_assets_command():
+        """Fingerprint and precompress static/ into static/dist/."""
+        manifest = build(static_dir)
+        app.extensions["asset_manifest"] = manifest
+        print(f"{len(manifest)} asset(s) written to {dist}")
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or vendor static assets.")
+    parser.add_argument("command", nargs="?", choices=("build", "vendor"), default="build")
+    parser.add_argument("--from", dest="source_dir", type=Path, metavar="DIR",
+                        help="vendor: read the pinned files from DIR instead of downloading")
+    args = parser.parse_args()
+
+    if args.command == "vendor":
+        vendor(source_dir=args.source_dir)
+        print(f"all files matched {VENDOR_LOCK.name}; now run `python -m familyhub.assets` to fingerprint")
+        return
+
+    built = build()
+    width = max(map(len, built), default=0)
+    for name, hashed in built.items():
+        print(f"{name:<{width}}  →  {DIST_NAME}/{hashed}")
+    print(f"manifest: {STATIC_DIR / DIST_NAME / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# familyhub/compression.py  – gzip / brotli for dynamic responses, negotiated per request
+"""Compress text responses the client says it can decode.
+
+An ``after_request`` hook picks the best coding from ``Accept-Encoding``
+(``br`` when the optional ``brotli`` package is installed, else
+``gzip``), honouring ``q=0``.  Only buffered responses of a compressible
+type and at least ``COMPRESS_MIN_BYTES`` are touched: streamed bodies
+(``/events``, ``/export/*``), file responses and tiny payloads go out
+as they are.  ``Vary: Accept-Encoding`` is always added for compressible
+types so caches keep the variants apart.
+"""
+from __future__ import annotations
+
+import gzip
+from typing import Dict, Optional, Sequence
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5  # good ratio at a CPU cost close to gzip -6
+COMPRESSIBLE_TYPES = {
+    "application/json", "application/javascript", "application/x-ndjson",
+    "image/svg+xml", "text/css", "text/csv", "text/html", "text/javascript", "text/plain",
+}
+
+
+def _accepted(header: str) -> Dict[str, float]:
+    """``{coding: q}`` from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def negotiate(header: Optional[str], available: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Best of *available* codings (default: what we can produce) for *header*.
+
+    Returns None when the client only takes the identity encoding.
+    """
+    if not header:
+        return None
+    accepted = _accepted(header)
+    candidates = available if available is not None else (["br"] if brotli is not None else []) + ["gzip"]
+    best = None
+    for coding in candidates:  # on equal q, br wins by coming first
+        q = accepted.get(coding, accepted.get("*", 0.0))
+        if q > 0 and (best is None or q > best[1]):
+            best = (coding, q)
+    return best[0] if best else None
+
+
+def compress(data: bytes, coding: str) -> bytes:
+    if coding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL)
+
+
+def init_app(app) -> None:
+    min_bytes = app.config["COMPRESS_MIN_BYTES"]
+
+    @app.after_request
+    def _compress(response):
+        if response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        response.vary.add("Accept-Encoding")
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or request.method == "HEAD"
+        ):
+            return response
+        coding = negotiate(request.headers.get("Accept-Encoding"))
+        if coding is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+
+        response.set_data(compress(data, coding))
+        response.headers["Content-Encoding"] = coding
+        return response
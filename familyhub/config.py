@@ -0,0 +1,79 @@
+# familyhub/config.py  – settings read from the environment
+"""App configuration.
+
+Every setting comes from an environment variable and is copied into
+``app.config`` by :func:`init_app` when :func:`familyhub.create_app`
+runs – no module reads the environment at import time – so tests and
+the benchmarks can point ``DATABASE_URL`` (or anything else) somewhere
+else before building an app.  The Mailgun credentials are the one
+exception: the outbox reads them when it sends.  Entry points that are
+not started by the ``flask`` command call :func:`load_env` first to
+pick up ``.env``.
+"""
+from __future__ import annotations
+
+import os
+
+# Connection pragmas applied to every new SQLite connection. "production"
+# lets the scheduler thread, report runs and request threads share the file
+# without "database is locked": WAL readers never block the writer, and a
+# writer waits up to busy_timeout ms for another one instead of failing.
+SQLITE_PROFILES = {
+    "production": {
+        "journal_mode": "WAL",
+        "busy_timeout": 5000,
+        "synchronous": "NORMAL",
+        "cache_size": -16000,        # KiB, i.e. ~16 MB page cache
+        "mmap_size": 134217728,      # 128 MB
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "auto_vacuum": "INCREMENTAL",  # only takes effect on new files; see migrations
+    },
+    "default": {
+        "foreign_keys": "ON",
+    },
+}
+SQLITE_PRAGMA_NAMES = ("journal_mode", "busy_timeout", "synchronous", "cache_size",
+                       "mmap_size", "temp_store", "foreign_keys", "auto_vacuum")
+
+
+def load_env() -> None:
+    """Read ``.env`` into ``os.environ`` (python-dotenv is imported only here)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def init_app(app) -> None:
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///chores.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SQLITE_PROFILE'] = os.getenv('SQLITE_PROFILE', 'production')
+    app.config['SQLITE_PRAGMAS'] = {
+        **SQLITE_PROFILES[app.config['SQLITE_PROFILE']],
+        # individual overrides, e.g. SQLITE_BUSY_TIMEOUT=10000
+        **{
+            name: os.environ[f"SQLITE_{name.upper()}"]
+            for name in SQLITE_PRAGMA_NAMES
+            if f"SQLITE_{name.upper()}" in os.environ
+        },
+    }
+    # weeks of raw ChoreHistory kept by the db_maintenance job; older weeks
+    # are folded into weekly_rollup and deleted. 0 (default) keeps everything.
+    app.config['HISTORY_RETENTION_WEEKS'] = int(os.getenv('HISTORY_RETENTION_WEEKS', '0'))
+    app.config['OUTBOX_WORKERS'] = int(os.getenv('OUTBOX_WORKERS', '2'))
+    # "batch": one Mailgun call per MAILGUN_BATCH_LIMIT recipients using
+    # recipient-variables; "individual": one message per user
+    app.config['REPORT_DISPATCH'] = os.getenv('REPORT_DISPATCH', 'batch').lower()
+    # smaller dynamic responses are not worth compressing
+    app.config['COMPRESS_MIN_BYTES'] = int(os.getenv('COMPRESS_MIN_BYTES', '500'))
+    # "stdlib" keeps Flask's own JSON provider even when orjson is installed
+    app.config['JSON_PROVIDER'] = os.getenv('JSON_PROVIDER', 'orjson').lower()
+    # log requests slower than this many seconds (unset = off)
+    slow = os.getenv('SLOW_REQUEST_SECONDS')
+    app.config['SLOW_REQUEST_SECONDS'] = float(slow) if slow else None
+    app.config['SCHEDULER_LOCK_FILE'] = os.getenv(
+        'SCHEDULER_LOCK_FILE', os.path.join(app.instance_path, 'scheduler.lock'))
+    # workers of one server share /metrics through this directory ('' = off)
+    app.config['METRICS_DIR'] = os.getenv(
+        'METRICS_DIR', os.path.join(app.instance_path, 'metrics'))
+    app.config['METRICS_EXPORT_SECONDS'] = float(os.getenv('METRICS_EXPORT_SECONDS', '10'))
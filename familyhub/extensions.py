@@ -0,0 +1,45 @@
+# familyhub/extensions.py  – the shared SQLAlchemy handle + SQLite plumbing
+"""Extension objects created without an app and bound in ``create_app()``.
+
+Models, jobs and reporting import ``db`` from here rather than from the
+app, so none of them needs the web layer to be importable.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+db = SQLAlchemy()
+
+
+def init_app(app) -> None:
+    db.init_app(app)
+    pragmas = app.config['SQLITE_PRAGMAS']
+
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", _apply_sqlite_pragmas)
+
+
+@contextmanager
+def read_snapshot():
+    """Yield a read-only session pinned to a single SQLite read transaction.
+
+    Every query inside the block sees the same committed state, and under
+    WAL the open snapshot never blocks request threads that write meanwhile.
+    """
+    with db.engine.connect() as conn:
+        # pysqlite does not BEGIN before SELECTs, so open the snapshot ourselves
+        conn.exec_driver_sql("BEGIN")
+        with Session(bind=conn) as session:
+            yield session
+        conn.rollback()
@@ -0,0 +1,99 @@
+# familyhub/leader.py  – elect one process to run the scheduler
+"""Single-leader election through an exclusive file lock.
+
+With several web workers every process imports the app, but only one
+may run the APScheduler cron jobs (``weekly_archive`` is not
+idempotent).  Each process calls :meth:`LeaderLock.start`; whoever gets
+the non-blocking exclusive lock on the lock file becomes leader and
+runs ``on_elected``.  The others retry every ``poll_seconds``.  The OS
+drops the lock when the holder exits or crashes, so a follower takes
+over within one poll interval – no stale-lock cleanup is needed.
+
+The lock file records the leader's pid for humans; its contents are not
+used for the election.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+try:  # POSIX
+    import fcntl
+
+    def _try_lock(fh: TextIO) -> bool:
+        try:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _try_lock(fh: TextIO) -> bool:
+        try:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+
+POLL_SECONDS = 15.0
+
+
+class LeaderLock:
+    """Hold *path* exclusively while this process is the leader."""
+
+    def __init__(self, path: Path | str, *, on_elected: Callable[[], None],
+                 poll_seconds: float = POLL_SECONDS) -> None:
+        self.path = Path(path)
+        self.on_elected = on_elected
+        self.poll_seconds = poll_seconds
+        self.is_leader = False
+        self._fh: Optional[TextIO] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def try_acquire(self) -> bool:
+        if self.is_leader:
+            return True
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a+", encoding="utf-8")
+        if not _try_lock(self._fh):
+            return False
+
+        self.is_leader = True
+        self._fh.seek(0)
+        self._fh.truncate()
+        self._fh.write(f"{os.getpid()}\n")
+        self._fh.flush()
+        print(f"[leader] pid {os.getpid()} holds {self.path}; running scheduled jobs here")
+        self.on_elected()
+        return True
+
+    def start(self) -> bool:
+        """Try once now; if another process leads, keep retrying in the background."""
+        if self.try_acquire():
+            return True
+        self._thread = threading.Thread(target=self._run, name="leader-election", daemon=True)
+        self._thread.start()
+        return False
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._fh is not None:
+            self._fh.close()  # closing the descriptor releases the lock
+            self._fh = None
+        self.is_leader = False
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                if self.try_acquire():
+                    return
+            except Exception as exc:  # noqa: BLE001 – keep trying
+                print(f"[leader] election error: {exc}")
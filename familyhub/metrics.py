@@ -0,0 +1,336 @@
+# familyhub/metrics.py  – request / SQL / scheduler-job instrumentation for /metrics
+"""In-process performance metrics in Prometheus text format.
+
+:func:`init_app` hooks a Flask app and its SQLAlchemy engine:
+
+* every request records latency, response size and status per route
+  (the URL rule, not the raw path, so label cardinality stays small);
+* every SQL statement run while a request is active is counted and
+  timed, and the per-request totals land in their own histograms – an
+  N+1 shows up as a jump in ``db_queries_per_request``;
+* ``SLOW_REQUEST_SECONDS`` (unset = off) prints one line for any request
+  slower than the threshold, with its query count and SQL time.
+
+Scheduler jobs are wrapped with :func:`timed_job`, which records their
+duration, outcome and – when the job returns a ``{name: count}`` dict –
+the row counts it reports.
+
+No client library is needed; the registry below is a few dozen lines.
+
+Several workers
+---------------
+The registry lives in each process, but every series carries a ``pid``
+label and, once :func:`start_export` runs (``familyhub.start`` does it
+in every serving process), each worker writes its registry to
+``METRICS_DIR/<pid>.json`` every ``METRICS_EXPORT_SECONDS``.  Whichever
+worker answers ``/metrics`` exports its own registry first and then
+renders every worker's latest snapshot, so one scrape target behind
+gunicorn sees every worker and no series ever goes backwards; the other
+workers' numbers lag by at most one export interval.  Snapshots older than three intervals (dead
+or replaced workers) are skipped.  Aggregate across workers in the
+query, e.g. ``sum without (pid) (rate(http_requests_total[5m]))``.
+"""
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import g, request
+from sqlalchemy import event
+
+# ---------------------------------------------------------------------------
+# tuning
+# ---------------------------------------------------------------------------
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0)
+
+# ---------------------------------------------------------------------------
+# registry
+# ---------------------------------------------------------------------------
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def render(self, snapshots: Dict[str, list]) -> List[str]:
+        """Lines for ``{pid: snapshot()}``, every sample labelled with its pid."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        names = self.labelnames + ("pid",)
+        for pid, samples in sorted(snapshots.items()):
+            for key, value in sorted(samples):
+                lines.append(f"{self.name}{_labels(names, [*key, pid])} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self.buckets = buckets
+        # per label set: [count per bucket (+Inf last)], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            counts, total = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[bisect_left(self.buckets, value)] += 1
+            total[0] += value
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(counts), total[0]]
+                    for key, (counts, total) in self._values.items()]
+
+    def render(self, snapshots: Dict[str, list]) -> List[str]:
+        """Lines for ``{pid: snapshot()}``, every sample labelled with its pid."""
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        names = self.labelnames + ("pid",)
+        for pid, samples in sorted(snapshots.items()):
+            for key, counts, total in sorted(samples):
+                values = [*key, pid]
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    le = _labels(names, values, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                cumulative += counts[-1]
+                le = _labels(names, values, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(names, values)} {total:g}")
+                lines.append(f"{self.name}_count{_labels(names, values)} {cumulative}")
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to build the response, per route.",
+    ("method", "route"))
+REQUESTS = Counter(
+    "http_requests_total", "Requests served, per route and status code.",
+    ("method", "route", "status"))
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Body size of non-streamed responses.",
+    ("method", "route"), SIZE_BUCKETS)
+REQUEST_QUERIES = Histogram(
+    "db_queries_per_request", "SQL statements executed while handling one request.",
+    ("method", "route"), QUERY_COUNT_BUCKETS)
+REQUEST_SQL_TIME = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL while handling one request.",
+    ("method", "route"))
+QUERIES = Counter("db_queries_total", "SQL statements executed by this process.")
+SQL_TIME = Counter("db_query_seconds_total", "Total time spent executing SQL.")
+JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Wall time of scheduler job runs.", ("job",), JOB_BUCKETS)
+JOB_RUNS = Counter("scheduler_job_runs_total", "Scheduler job runs by outcome.", ("job", "outcome"))
+JOB_ROWS = Counter("scheduler_job_rows_total", "Row counts reported by scheduler jobs.", ("job", "kind"))
+
+REGISTRY = (REQUEST_LATENCY, REQUESTS, RESPONSE_SIZE, REQUEST_QUERIES, REQUEST_SQL_TIME,
+            QUERIES, SQL_TIME, JOB_DURATION, JOB_RUNS, JOB_ROWS)
+
+
+def snapshot() -> Dict[str, list]:
+    """This process's registry as ``{metric name: samples}`` (JSON-safe)."""
+    return {metric.name: metric.snapshot() for metric in REGISTRY}
+
+
+def render() -> str:
+    """All metrics of every live worker in Prometheus text format 0.0.4."""
+    if _export_dir is None:
+        workers = {str(os.getpid()): snapshot()}
+    else:
+        # everything comes from the files, this worker's included, so a
+        # later scrape answered elsewhere never sees older numbers
+        _export()
+        workers = _read_exports()
+    return "\n".join(
+        line
+        for metric in REGISTRY
+        for line in metric.render({pid: snap.get(metric.name, []) for pid, snap in workers.items()})
+    ) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# sharing between worker processes
+# ---------------------------------------------------------------------------
+
+_export_dir: Optional[str] = None
+_export_seconds = 10.0
+
+
+def _export_path() -> str:
+    return os.path.join(_export_dir, f"{os.getpid()}.json")
+
+
+def _export() -> None:
+    fd, tmp = tempfile.mkstemp(dir=_export_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as fh:
+        json.dump(snapshot(), fh)
+    os.replace(tmp, _export_path())  # readers never see half a file
+
+
+def _remove_export() -> None:
+    try:
+        os.remove(_export_path())
+    except OSError:
+        pass
+
+
+def _read_exports() -> Dict[str, Dict[str, list]]:
+    workers = {}
+    oldest = time.time() - 3 * _export_seconds
+    for entry in os.scandir(_export_dir):
+        pid, ext = os.path.splitext(entry.name)
+        if ext != ".json":
+            continue
+        try:
+            if entry.stat().st_mtime < oldest:
+                continue  # the worker is gone (or hung)
+            with open(entry.path) as fh:
+                workers[pid] = json.load(fh)
+        except (OSError, ValueError):
+            continue  # replaced or removed while we looked
+    return workers
+
+
+def start_export(directory: str, interval: float = 10.0) -> None:
+    """Share this process's metrics with the other workers through *directory*."""
+    global _export_dir, _export_seconds
+    if _export_dir is not None or not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    _export_dir, _export_seconds = directory, interval
+
+    def _loop():
+        while True:
+            try:
+                _export()
+            except OSError as exc:
+                print(f"[metrics] export to {directory} failed: {exc}")
+            time.sleep(interval)
+
+    threading.Thread(target=_loop, name="metrics-export", daemon=True).start()
+    atexit.register(_remove_export)
+
+
+# ---------------------------------------------------------------------------
+# Flask + SQLAlchemy hooks
+# ---------------------------------------------------------------------------
+
+# per-thread [queries, sql seconds] for the request currently being handled
+_current = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    QUERIES.inc()
+    SQL_TIME.inc(elapsed)
+    stats = getattr(_current, "stats", None)
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += elapsed
+
+
+def _route() -> str:
+    return request.url_rule.rule if request.url_rule else "<unmatched>"
+
+
+def init_app(app, engine) -> None:
+    """Instrument *app* and *engine*; call once at start-up."""
+    slow_seconds = app.config["SLOW_REQUEST_SECONDS"]
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+        _current.stats = [0, 0.0]
+
+    @app.after_request
+    def _record(response):
+        start = g.pop("metrics_start", None)
+        stats = getattr(_current, "stats", None) or [0, 0.0]
+        _current.stats = None
+        if start is None:
+            return response
+
+        elapsed = time.perf_counter() - start
+        labels = {"method": request.method, "route": _route()}
+        REQUEST_LATENCY.observe(elapsed, **labels)
+        REQUESTS.inc(status=str(response.status_code), **labels)
+        REQUEST_QUERIES.observe(stats[0], **labels)
+        REQUEST_SQL_TIME.observe(stats[1], **labels)
+        if not response.is_streamed:
+            RESPONSE_SIZE.observe(response.calculate_content_length() or 0, **labels)
+
+        if slow_seconds is not None and elapsed >= slow_seconds:
+            print(f"[slow] {request.method} {request.full_path.rstrip('?')} "
+                  f"{response.status_code} {elapsed * 1000:.1f} ms "
+                  f"({stats[0]} queries, {stats[1] * 1000:.1f} ms SQL)")
+        return response
+
+    @app.teardown_request
+    def _clear(exc):
+        _current.stats = None
+
+
+def timed_job(name: str):
+    """Decorator recording duration, outcome and returned row counts of a job."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                JOB_RUNS.inc(job=name, outcome="error")
+                raise
+            finally:
+                JOB_DURATION.observe(time.perf_counter() - start, job=name)
+            JOB_RUNS.inc(job=name, outcome="ok" if result is not None else "skipped")
+            if isinstance(result, dict):
+                for kind, count in result.items():
+                    if isinstance(count, int):
+                        JOB_ROWS.inc(count, job=name, kind=kind)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,152 @@
+# familyhub/models.py  – tables + the board version / change feed helpers
+"""SQLAlchemy models.
+
+Only depends on :mod:`familyhub.extensions`, so reporting, the outbox and
+the maintenance jobs can use the tables without importing the routes.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from .extensions import db
+
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(100), unique=True, nullable=False)
+    chores = db.relationship('Chore', backref='user', lazy=True, foreign_keys='Chore.user_id')
+
+class Chore(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    description = db.Column(db.String(200), nullable=False)
+    completed = db.Column(db.Boolean, default = False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    day = db.Column(db.String(100), nullable=False, default = 'Monday')
+    rotation_type = db.Column(db.String(10), nullable=False, default = "static")
+    base_user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
+    rotation_members = db.relationship(
+        'ChoreRotation', backref='chore', lazy=True,
+        order_by='ChoreRotation.position', cascade='all, delete-orphan')
+
+class ChoreRotation(db.Model):
+    # ordered rotation membership of a chore, one row per user
+    chore_id = db.Column(db.Integer, db.ForeignKey('chore.id'), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+
+    user = db.relationship('User')
+
+    __table_args__ = (
+        db.Index('ix_chore_rotation_user_id', 'user_id'),
+    )
+
+class ChoreHistory(db.Model):
+    id = db.Column(db.Integer, primary_key = True)
+    chore_id = db.Column(db.Integer, db.ForeignKey('chore.id'), nullable=False)
+    username = db.Column(db.String(100), nullable=False)
+    date = db.Column(db.Date, nullable=False)
+    completed = db.Column(db.Boolean, nullable=False)
+    day = db.Column(db.String(100), nullable=False)
+    rotation_type = db.Column(db.String(10), nullable=False)
+
+    chore = db.relationship('Chore', backref='history')
+
+    __table_args__ = (
+        db.Index('ix_chore_history_date_username', 'date', 'username'),
+        # one snapshot row per chore per archive date; archiving upserts on it
+        db.Index('uq_chore_history_chore_id_date', 'chore_id', 'date', unique=True),
+    )
+
+class WeeklyRollup(db.Model):
+    # per user / snapshot / weekday completion counts, refreshed at archive time
+    __tablename__ = 'weekly_rollup'
+    username = db.Column(db.String(100), primary_key=True)
+    snapshot_date = db.Column(db.Date, primary_key=True)
+    day = db.Column(db.String(100), primary_key=True)
+    total = db.Column(db.Integer, nullable=False)
+    completed = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_weekly_rollup_snapshot_date', 'snapshot_date'),
+    )
+
+class AllowanceLedger(db.Model):
+    # allowance earned per user per snapshot, fixed at archive time
+    __tablename__ = 'allowance_ledger'
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(100), nullable=False)
+    snapshot_date = db.Column(db.Date, nullable=False)
+    total = db.Column(db.Integer, nullable=False)
+    completed = db.Column(db.Integer, nullable=False)
+    tier = db.Column(db.String(10), nullable=False)  # full/half/none
+    amount = db.Column(db.Float, nullable=False)
+    configured_amount = db.Column(db.Float, nullable=False)  # config allowance at the time
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('uq_allowance_ledger_username_snapshot_date', 'username', 'snapshot_date', unique=True),
+    )
+
+class GroceryItem(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    item_name = db.Column(db.String(200), nullable=False)
+    added_by = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class BoardState(db.Model):
+    # single row (id=1) whose version moves on every change to the chore board
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+
+def bump_board_version():
+    """Advance the board version as part of the current transaction."""
+    stmt = sqlite_insert(BoardState).values(id=1, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[BoardState.id],
+        set_={"version": BoardState.version + 1},
+    )
+    db.session.execute(stmt)
+
+
+class ChangeEvent(db.Model):
+    # append-only change feed; the id doubles as the event version for /events
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = {'sqlite_autoincrement': True}  # never reuse pruned ids
+
+
+CHANGE_EVENT_RETENTION = timedelta(days=7)
+
+
+class EmailOutbox(db.Model):
+    # durable queue of Mailgun payloads, drained by outbox.OutboxWorker
+    id = db.Column(db.Integer, primary_key=True)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='pending')  # pending/sending/sent/failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+
+def publish_change(kind, payload):
+    """Queue a change event; it commits (or rolls back) with the write itself."""
+    db.session.add(ChangeEvent(kind=kind, payload=payload))
+
+
+def current_board_version():
+    return db.session.query(BoardState.version).filter_by(id=1).scalar() or 0
+
+
+def board_etag():
+    return f"board-{current_board_version()}"
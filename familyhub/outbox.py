@@ -0,0 +1,247 @@
+# familyhub/outbox.py  – durable e-mail outbox + Mailgun delivery worker pool
+"""Durable e-mail outbox.
+
+Callers never talk to Mailgun inside a request or the scheduler job any
+more: they add an ``EmailOutbox`` row in their own transaction and
+return.  A small pool of daemon threads claims due rows, posts them
+through one shared keep-alive ``requests.Session`` and records the
+outcome.  Transient failures (timeouts, 429, 5xx) are retried with
+exponential backoff; a crash mid-send leaves the row claimed, and it is
+picked up again once the claim goes stale.
+
+Point ``MAILGUN_BASE_URL`` at ``fake_mailgun.py`` to exercise the whole
+path locally.  Without ``MAILGUN_API_KEY`` / ``MAILGUN_DOMAIN`` delivery
+is a dry-run that prints the message.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from email.utils import parseaddr
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from .extensions import db
+from .models import EmailOutbox
+
+if TYPE_CHECKING:
+    import requests
+
+# ---------------------------------------------------------------------------
+# tuning
+# ---------------------------------------------------------------------------
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = timedelta(seconds=30)     # 30s, 1m, 2m, 4m …
+STALE_CLAIM = timedelta(minutes=10)      # a "sending" row older than this is re-tried
+REQUEST_TIMEOUT = (5, 15)                # connect, read (seconds)
+POLL_SECONDS = 5.0
+
+
+class PermanentDeliveryError(Exception):
+    """The provider rejected the message; retrying will not help."""
+
+
+# ---------------------------------------------------------------------------
+# transport
+# ---------------------------------------------------------------------------
+
+_http: Optional[requests.Session] = None
+_http_lock = threading.Lock()
+
+
+def http_session() -> requests.Session:
+    """Process-wide keep-alive session; retries only sends that never landed."""
+    global _http
+    with _http_lock:
+        if _http is None:
+            # imported on first delivery: web workers that never send pay nothing
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            # Only retry where Mailgun cannot have accepted the message: the
+            # connection never opened, or it answered 429/503.  A read error
+            # or timeout may follow an accepted send, so that goes back to
+            # the outbox backoff instead of being POSTed again right away.
+            retry = Retry(
+                total=3,
+                connect=3,
+                read=0,
+                other=0,
+                status=2,
+                backoff_factor=0.5,
+                status_forcelist=(429, 503),
+                allowed_methods=frozenset({"POST"}),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http = session
+        return _http
+
+
+def message_payload(msg: EmailMessage) -> Dict[str, Any]:
+    """Mailgun form fields (minus ``from``) for a plain-text message."""
+    _, to_email = parseaddr(msg["To"])
+    if not to_email:
+        raise ValueError(f"Invalid To header: {msg['To']}")
+    return {"to": [to_email], "subject": msg["Subject"] or "", "text": msg.get_content()}
+
+
+def deliver(payload: Dict[str, Any]) -> None:
+    """POST one payload to Mailgun (or print it when not configured)."""
+    api_key = os.getenv("MAILGUN_API_KEY")
+    domain = os.getenv("MAILGUN_DOMAIN")
+    base_url = os.getenv("MAILGUN_BASE_URL", "https://api.mailgun.net")
+
+    if not api_key or not domain:
+        print("\n----- EMAIL (dry-run) -----")
+        print(f"To: {', '.join(payload['to'])}")
+        print(f"Subject: {payload['subject']}\n")
+        print(payload["text"])
+        if "recipient-variables" in payload:
+            print("\n--- recipient-variables ---")
+            print(json.dumps(json.loads(payload["recipient-variables"]),
+                             indent=2, ensure_ascii=False))
+        print("----- END -----\n")
+        return
+
+    resp = http_session().post(
+        f"{base_url}/v3/{domain}/messages",
+        auth=("api", api_key),
+        data={"from": f"Family Hub <mailgun@{domain}>", **payload},
+        timeout=REQUEST_TIMEOUT,
+    )
+
+    if resp.status_code == 429 or resp.status_code >= 500:
+        raise RuntimeError(f"Mailgun error {resp.status_code}: {resp.text}")
+    if resp.status_code >= 400:
+        raise PermanentDeliveryError(f"Mailgun error {resp.status_code}: {resp.text}")
+
+
+# ---------------------------------------------------------------------------
+# queue
+# ---------------------------------------------------------------------------
+
+_wakeup = threading.Event()
+
+
+def enqueue(db_session, payloads: Iterable[Dict[str, Any]]) -> List[int]:
+    """Add outbox rows to *db_session*; they are sent once the caller commits.
+
+    Call :func:`wake` after the commit so idle workers pick them up now.
+    """
+    rows = [EmailOutbox(payload=p) for p in payloads]
+    db_session.add_all(rows)
+    db_session.flush()
+    return [r.id for r in rows]
+
+
+def wake() -> None:
+    _wakeup.set()
+
+
+def _claim_next(db_session):
+    """Atomically mark the next due row as sending; return it or None."""
+    now = datetime.utcnow()
+    due = db.or_(
+        db.and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        db.and_(EmailOutbox.status == "sending", EmailOutbox.claimed_at < now - STALE_CLAIM),
+    )
+    next_id = (
+        db.select(EmailOutbox.id).where(due).order_by(EmailOutbox.id).limit(1).scalar_subquery()
+    )
+    row = db_session.execute(
+        db.update(EmailOutbox)
+        .where(EmailOutbox.id == next_id, due)
+        .values(status="sending", claimed_at=now, attempts=EmailOutbox.attempts + 1)
+        .returning(EmailOutbox.id, EmailOutbox.payload, EmailOutbox.attempts)
+        .execution_options(synchronize_session=False)
+    ).first()
+    db_session.commit()
+    return row
+
+
+def _record(db_session, row, error: Optional[Exception]) -> None:
+    now = datetime.utcnow()
+    if error is None:
+        values = {"status": "sent", "sent_at": now, "last_error": None}
+    elif isinstance(error, PermanentDeliveryError) or row.attempts >= MAX_ATTEMPTS:
+        values = {"status": "failed", "last_error": str(error)[:500]}
+    else:
+        delay = BACKOFF_BASE * (2 ** (row.attempts - 1))
+        values = {"status": "pending", "next_attempt_at": now + delay,
+                  "last_error": str(error)[:500]}
+    db_session.execute(
+        db.update(EmailOutbox).where(EmailOutbox.id == row.id).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db_session.commit()
+
+
+def process_one(db_session) -> bool:
+    """Send the next due row. Returns False when nothing was due."""
+    row = _claim_next(db_session)
+    if row is None:
+        return False
+    try:
+        deliver(row.payload)
+    except Exception as exc:  # noqa: BLE001 – every failure is recorded on the row
+        print(f"[outbox] message {row.id} attempt {row.attempts} failed: {exc}")
+        _record(db_session, row, exc)
+    else:
+        _record(db_session, row, None)
+    return True
+
+
+def drain(db_session) -> int:
+    """Send everything currently due in the calling thread (CLI use)."""
+    sent = 0
+    while process_one(db_session):
+        sent += 1
+    return sent
+
+
+# ---------------------------------------------------------------------------
+# worker pool
+# ---------------------------------------------------------------------------
+
+class OutboxWorker:
+    """A few daemon threads draining the outbox for one Flask *app*."""
+
+    def __init__(self, app, *, threads: int = 2, poll_seconds: float = POLL_SECONDS) -> None:
+        self.app = app
+        self.threads = threads
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for n in range(self.threads):
+            t = threading.Thread(target=self._run, name=f"outbox-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        wake()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads.clear()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    busy = process_one(db.session)
+            except Exception as exc:  # noqa: BLE001 – keep the worker alive
+                print(f"[outbox] worker error: {exc}")
+                busy = False
+            if not busy:
+                _wakeup.wait(self.poll_seconds)
+                _wakeup.clear()
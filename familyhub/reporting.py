@@ -0,0 +1,446 @@
+# familyhub/reporting.py  – config sync + allowance & email draft (snapshot‑based)
+"""Weekly reporting helper (snapshot edition).
+
+Changes in this revision
+------------------------
+* **No “week” window** – report uses the *latest* archive snapshot
+  (all `ChoreHistory` rows that share the most‑recent `date`).
+* Logic elsewhere (scheduler / manual reset) stays the same; they always
+  **archive first, then call** `generate_weekly_reports()`.
+* Email wording adjusted: “snapshot of YYYY‑MM‑DD”.
+
+Other functionality (config sync, allowance tiers, SMTP dry‑run etc.)
+remains unchanged.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import func
+
+from flask import current_app
+
+from . import outbox
+from .extensions import db, read_snapshot
+from .models import AllowanceLedger, Chore, ChoreHistory, User
+
+# ---------------------------------------------------------------------------
+# config helpers
+# ---------------------------------------------------------------------------
+
+CONFIG_FILE = Path("reporting_config.yaml")
+MAILGUN_BATCH_LIMIT = 1000  # provider maximum recipients per batch send
+DEFAULT_USER_BLOCK: Dict[str, Any] = {"email": "", "allowance": 0}
+
+
+# parsed config per resolved path, keyed on the file's (mtime_ns, size) so
+# edits made by hand are still picked up on the next call
+_config_cache: Dict[Path, Tuple[Tuple[int, int], Dict[str, Dict[str, Any]]]] = {}
+_config_lock = threading.RLock()
+
+try:  # POSIX
+    import fcntl
+
+    def _lock_file(fh) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(fh) -> None:
+        while True:
+            try:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)  # gives up after ~10 s
+                return
+            except OSError:
+                continue
+
+
+@contextmanager
+def _config_edit(path: Path) -> Iterator[None]:
+    """Serialise load → modify → save of *path* across threads *and* processes.
+
+    Every gunicorn worker edits the file when users are added or removed;
+    the lock lives on a sidecar file because _save_config replaces the
+    config file itself.  The OS drops it if the holder dies.
+    """
+    lock_path = path.with_name(f".{path.name}.lock")
+    with _config_lock, open(lock_path, "a+") as fh:
+        _lock_file(fh)
+        yield  # closing fh releases the lock
+
+
+def _config_stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_config(path: Path = CONFIG_FILE) -> Dict[str, Dict[str, Any]]:
+    """Return a private copy of the parsed config, re-reading only on change."""
+    path = Path(path)
+    stamp = _config_stamp(path)
+    if stamp is None:
+        return {}
+    key = path.resolve()
+    with _config_lock:
+        cached = _config_cache.get(key)
+        if cached is None or cached[0] != stamp:
+            import yaml  # only when the file actually has to be parsed
+
+            with path.open("r", encoding="utf‑8") as fh:
+                cached = (stamp, yaml.safe_load(fh) or {})
+            _config_cache[key] = cached
+        return copy.deepcopy(cached[1])
+
+
+def _save_config(data: Dict[str, Dict[str, Any]], path: Path = CONFIG_FILE) -> None:
+    """Write *data* atomically (temp file + rename) and refresh the cache."""
+    import yaml
+
+    path = Path(path)
+    with _config_lock:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            # mkstemp creates 0600; keep the existing file's permissions
+            os.chmod(tmp, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+            with os.fdopen(fd, "w", encoding="utf‑8") as fh:
+                yaml.dump(data, fh, sort_keys=True, default_flow_style=False, allow_unicode=True)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        _config_cache[path.resolve()] = (_config_stamp(path), copy.deepcopy(data))
+
+
+# ---------------------------------------------------------------------------
+# public API – sync
+# ---------------------------------------------------------------------------
+
+def sync_config(db_session, *, path: Path | str = CONFIG_FILE) -> Dict[str, Dict[str, Any]]:
+    """Synchronise *path* with DB users and return the dict.
+
+    The file is only rewritten when the set of user blocks actually changed.
+    """
+    path = Path(path)
+    live_usernames = {name for (name,) in db_session.query(User.username).all()}
+
+    with _config_edit(path):
+        current = _load_config(path)
+        cfg = copy.deepcopy(current)
+
+        # add / update
+        for name in live_usernames:
+            block = cfg.setdefault(name, {})
+            for k, v in DEFAULT_USER_BLOCK.items():
+                block.setdefault(k, v)
+
+        # hard‑prune removed users
+        for name in list(cfg):
+            if name not in live_usernames:
+                del cfg[name]
+
+        if cfg != current or _config_stamp(path) is None:
+            _save_config(cfg, path)
+    return cfg
+
+
+def add_config_user(username: str, *, path: Path | str = CONFIG_FILE) -> None:
+    """Give a newly created user a default block (no-op if present)."""
+    path = Path(path)
+    with _config_edit(path):
+        cfg = _load_config(path)
+        if username in cfg:
+            return
+        cfg[username] = dict(DEFAULT_USER_BLOCK)
+        _save_config(cfg, path)
+
+
+def remove_config_user(username: str, *, path: Path | str = CONFIG_FILE) -> None:
+    """Drop a deleted user's block (no-op if absent)."""
+    path = Path(path)
+    with _config_edit(path):
+        cfg = _load_config(path)
+        if cfg.pop(username, None) is None:
+            return
+        _save_config(cfg, path)
+
+
+# ---------------------------------------------------------------------------
+# allowance calculation
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SnapshotStats:
+    total: int
+    completed: int
+
+    @property
+    def pct(self) -> float:
+        return 0.0 if self.total == 0 else self.completed / self.total
+
+
+ALLOWANCE_TIERS = {"full": 1.0, "half": 0.5, "none": 0.0}
+
+
+def allowance_tier(stats: SnapshotStats) -> str:
+    """Name of the 100 / 50 / 0 tier *stats* falls into."""
+    if stats.pct >= 1.0:
+        return "full"
+    if stats.pct >= 0.5:
+        return "half"
+    return "none"
+
+
+def calc_allowance(stats: SnapshotStats, full_amount: float | int) -> float:
+    """Return the earned allowance based on the 100 / 50 / 0 rule."""
+    tier = allowance_tier(stats)
+    if tier == "full":
+        return full_amount
+    return full_amount * ALLOWANCE_TIERS[tier]
+
+
+def configured_allowances(path: Path | str = CONFIG_FILE) -> Dict[str, float]:
+    """``{username: full weekly allowance}`` from the (cached) config."""
+    return {
+        name: (block or {}).get("allowance", 0) or 0
+        for name, block in _load_config(Path(path)).items()
+    }
+
+
+# ---------------------------------------------------------------------------
+# e‑mail helpers
+# ---------------------------------------------------------------------------
+
+def _queue_payloads(payloads: Sequence[Dict[str, Any]], recipients: int) -> None:
+    """Hand Mailgun *payloads* to the durable outbox in their own transaction."""
+    if not payloads:
+        return
+    outbox.enqueue(db.session, payloads)
+    db.session.commit()
+    outbox.wake()
+    print(f"{recipients} report e-mail(s) queued in {len(payloads)} API call(s)")
+
+
+REPORT_SUBJECT = "Your weekly chore report"
+REPORT_TEMPLATE = """Hi {name},
+
+Here’s your chore report – snapshot of {snapshot}.
+You completed {completed}/{total} chores ({pct}).
+Earned allowance: ${allowance}
+
+Details:
+{details}
+
+Nice work!  — Family Hub"""
+REPORT_FIELDS = ("name", "completed", "total", "pct", "allowance", "details")
+
+
+def _report_fields(
+    user: str,
+    stats: SnapshotStats,
+    allowance: float,
+    chores: Sequence[dict[str, Any]],
+) -> Dict[str, str]:
+    """Per-user values substituted into REPORT_TEMPLATE."""
+    details = []
+    for c in chores:
+        mark = "✓" if c["completed"] else "✗"
+        details.append(f"  {mark} {c['day']:<9} – {c['description']}")
+    return {
+        "name": user,
+        "completed": str(stats.completed),
+        "total": str(stats.total),
+        "pct": f"{stats.pct:.0%}",
+        "allowance": f"{allowance:.2f}",
+        "details": "\n".join(details),
+    }
+
+
+def _individual_payloads(
+    reports: Sequence[tuple[str, Dict[str, str]]], *, snapshot_date: date
+) -> list[Dict[str, Any]]:
+    """One Mailgun payload per ``(email, fields)`` pair."""
+    payloads = []
+    for email_addr, fields in reports:
+        msg = EmailMessage()
+        msg["Subject"] = REPORT_SUBJECT
+        msg["To"] = email_addr
+        msg.set_content(REPORT_TEMPLATE.format(snapshot=f"{snapshot_date:%Y‑%m‑%d}", **fields))
+        payloads.append(outbox.message_payload(msg))
+    return payloads
+
+
+def _batch_payloads(
+    reports: Sequence[tuple[str, Dict[str, str]]], *, snapshot_date: date
+) -> list[Dict[str, Any]]:
+    """Mailgun batch-send payloads for ``(email, fields)`` pairs.
+
+    The body is sent once with ``%recipient.<field>%`` placeholders and
+    each recipient's values travel in ``recipient-variables``, so Mailgun
+    renders every report and no recipient sees the others' addresses.
+    ``recipient-variables`` is keyed by address, so reports for an
+    address shared by several users (a parent's inbox for two kids) go
+    out as individual messages instead.
+    """
+    per_address: Dict[str, int] = {}
+    for email_addr, _ in reports:
+        key = email_addr.lower()
+        per_address[key] = per_address.get(key, 0) + 1
+    unique = [r for r in reports if per_address[r[0].lower()] == 1]
+    shared = [r for r in reports if per_address[r[0].lower()] > 1]
+
+    text = REPORT_TEMPLATE.format(
+        snapshot=f"{snapshot_date:%Y‑%m‑%d}",
+        **{name: f"%recipient.{name}%" for name in REPORT_FIELDS},
+    )
+    payloads = []
+    for start in range(0, len(unique), MAILGUN_BATCH_LIMIT):
+        chunk = unique[start:start + MAILGUN_BATCH_LIMIT]
+        payloads.append({
+            "to": [email for email, _ in chunk],
+            "subject": REPORT_SUBJECT,
+            "text": text,
+            "recipient-variables": json.dumps(
+                {email: fields for email, fields in chunk}, ensure_ascii=False
+            ),
+        })
+    return payloads + _individual_payloads(shared, snapshot_date=snapshot_date)
+
+
+# ---------------------------------------------------------------------------
+# main entry: generate & dispatch snapshot reports
+# ---------------------------------------------------------------------------
+
+def build_weekly_reports(db_session, cfg: Dict[str, Dict[str, Any]] | None = None):
+    """Compute per-user reports for the *latest* snapshot without sending.
+
+    Returns ``(snapshot_date, reports)``; each report is a dict with
+    ``user``, ``email``, ``stats``, ``allowance``, ``chores`` and ``send``
+    (False when the user has no e-mail or allowance configured).  Stats
+    come from one ``GROUP BY username`` aggregate and the detail lines
+    from one query joined to ``Chore``.
+    """
+    latest: date | None = db_session.query(func.max(ChoreHistory.date)).scalar()
+    if latest is None:
+        return None, []
+    if cfg is None:
+        cfg = _load_config()
+
+    in_snapshot = ChoreHistory.date == latest
+    stats_by_user = {
+        username: SnapshotStats(total=total, completed=int(completed or 0))
+        for username, total, completed in db_session.execute(
+            db.select(
+                ChoreHistory.username,
+                func.count(ChoreHistory.id),
+                func.sum(db.case((ChoreHistory.completed, 1), else_=0)),
+            )
+            .where(in_snapshot, ChoreHistory.username.in_(db.select(User.username)))
+            .group_by(ChoreHistory.username)
+        )
+    }
+
+    chores_by_user: Dict[str, list[dict[str, Any]]] = {}
+    for username, day, completed, description in db_session.execute(
+        db.select(ChoreHistory.username, ChoreHistory.day, ChoreHistory.completed, Chore.description)
+        .outerjoin(Chore, Chore.id == ChoreHistory.chore_id)
+        .where(in_snapshot)
+        .order_by(ChoreHistory.username, ChoreHistory.id)
+    ):
+        if username in stats_by_user:
+            chores_by_user.setdefault(username, []).append({
+                "day": day,
+                "description": description if description is not None else "(deleted chore)",
+                "completed": completed,
+            })
+
+    # amounts recorded at archive time win over today's config values
+    ledger = dict(db_session.execute(
+        db.select(AllowanceLedger.username, AllowanceLedger.amount)
+        .where(AllowanceLedger.snapshot_date == latest)
+    ).all())
+
+    reports = []
+    for username in sorted(stats_by_user):
+        stats = stats_by_user[username]
+        block = cfg.get(username, DEFAULT_USER_BLOCK)
+        full_allow = block.get("allowance", 0) or 0
+        email_addr = (block.get("email") or "").strip()
+        reports.append({
+            "user": username,
+            "email": email_addr,
+            "stats": stats,
+            "allowance": ledger.get(username, calc_allowance(stats, full_allow)),
+            "chores": chores_by_user.get(username, []),
+            "send": bool(full_allow and email_addr),  # opted out / not configured yet
+        })
+    return latest, reports
+
+
+def generate_weekly_reports(db_session) -> None:  # keeping name for back‑compat
+    """Send a report based on the *latest* ChoreHistory snapshot."""
+    cfg = sync_config(db_session)
+    latest, reports = build_weekly_reports(db_session, cfg)
+    if latest is None:
+        print("No history rows yet – nothing to report.")
+        return
+
+    outgoing: list[tuple[str, Dict[str, str]]] = [
+        (r["email"], _report_fields(r["user"], r["stats"], r["allowance"], r["chores"]))
+        for r in reports
+        if r["send"]
+    ]
+
+    if current_app.config["REPORT_DISPATCH"] == "batch":
+        payloads = _batch_payloads(outgoing, snapshot_date=latest)
+    else:
+        payloads = _individual_payloads(outgoing, snapshot_date=latest)
+    _queue_payloads(payloads, len(outgoing))
+
+
+# ---------------------------------------------------------------------------
+# CLI helper
+# ---------------------------------------------------------------------------
+
+def main() -> None:  # type: ignore[override]
+    """`python reporting.py [sync|report]` (defaults to *sync*)."""
+    from sys import argv
+    from . import create_app
+    from .config import load_env
+
+    cmd = (argv[1] if len(argv) > 1 else "sync").lower()
+    load_env()
+    app = create_app(web=False)  # db + models only: no routes, scheduler or asset hooks
+
+    with app.app_context():
+        # reads only – a WAL snapshot keeps the dashboard writable meanwhile
+        with read_snapshot() as session:
+            if cmd == "report":
+                generate_weekly_reports(session)
+            else:
+                updated = sync_config(session)
+                print(f"config synced → {len(updated)} user blocks")
+
+        if cmd == "report":
+            # no worker pool in the CLI – send what was just queued here
+            print(f"{outbox.drain(db.session)} e-mail(s) processed")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,1015 @@
+# familyhub/routes.py  – the HTTP API and dashboard page
+"""All HTTP endpoints, on one blueprint registered by ``create_app()``."""
+import csv
+import io
+import json
+import time
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, current_app, jsonify, render_template, request, stream_with_context
+from sqlalchemy.orm import joinedload, selectinload
+
+from . import metrics
+from .extensions import db, read_snapshot
+from .models import (
+    AllowanceLedger, ChangeEvent, Chore, ChoreHistory, ChoreRotation, EmailOutbox, GroceryItem,
+    User, WeeklyRollup, board_etag, bump_board_version, publish_change,
+)
+from .reporting import add_config_user, build_weekly_reports, remove_config_user
+from .scheduler import (
+    archive_chores_snapshot, next_rotation_date, rotation_index, rotation_members, user_maps,
+    weekly_archive_task,
+)
+
+bp = Blueprint('hub', __name__)
+
+
+def chore_to_dict(chore):
+    return {
+        "id": chore.id,
+        "description": chore.description,
+        "completed": chore.completed,
+        "user_id": chore.user_id,
+        "username": chore.user.username,  # Add the username from the user relationship
+        "day" : chore.day,
+        "rotation_type" : chore.rotation_type,
+        "rotation_order" : [m.user.username for m in chore.rotation_members],
+        "rotation_user_ids" : [m.user_id for m in chore.rotation_members]
+    }
+
+
+def grocery_to_dict(item):
+    return {"id": item.id, "item_name": item.item_name, "added_by": item.added_by,
+            "created_at": item.created_at.isoformat() if item.created_at else None}
+
+
+VALID_DAYS = {"Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"}
+
+
+class OperationError(Exception):
+    """A write operation was rejected; carries the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+# The *_op functions below hold the validation and writes shared by the
+# single routes and POST /batch. They never commit: the caller does, once.
+
+
+def _get_live(model, id):
+    """``db.session.get`` that also misses rows an earlier op in this
+    transaction deleted (they stay in the identity map until the flush)."""
+    obj = db.session.get(model, id)
+    if obj is None or obj in db.session.deleted:
+        return None
+    return obj
+
+
+@bp.route('/')
+def home():
+    return render_template('chore_tracker.html')
+
+@bp.route('/chores', methods=['GET'])
+def get_chores():
+    # Read the version *before* the rows: a write landing in between only
+    # costs the client one extra download, never a stale 304.
+    # The tag is weak: gzip, br and identity bodies of one version share it.
+    etag = board_etag()
+    if request.if_none_match.contains_weak(etag):
+        not_modified = current_app.response_class(status=304)
+        not_modified.set_etag(etag, weak=True)
+        not_modified.headers['Cache-Control'] = 'no-cache'
+        return not_modified
+
+    # One joined SELECT for chores + owners and one for all rotation members,
+    # instead of lazy lookups per chore
+    chores = (
+        Chore.query
+        .options(
+            joinedload(Chore.user),
+            selectinload(Chore.rotation_members).joinedload(ChoreRotation.user),
+        )
+        .order_by(Chore.id)
+        .all()
+    )
+    chore_list = [chore_to_dict(chore) for chore in chores]
+    response = jsonify(chore_list)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@bp.route('/chores/<int:id>', methods=['GET'])
+def get_chore(id):
+    chore = Chore.query.get_or_404(id)
+    return jsonify({
+        "id": chore.id,
+        "description": chore.description,
+        "completed": chore.completed
+    })
+
+
+
+def create_chore_op(data):
+    description = data.get('description')
+    user_id = data.get('user_id')
+    day = data.get('day') # Expecting a day of the week
+    rotation_type = data.get('rotation_type','static')
+    rotation_order = data.get('rotation_order',[])
+    rotation_user_ids = data.get('rotation_user_ids')
+
+    if not description or not user_id:
+        raise OperationError("Description and user_id are required")
+    
+    if not day in VALID_DAYS:
+        raise OperationError("Invalid day(s) provided")
+
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        raise OperationError("user_id must be an integer")
+
+    # Rotation members may be given as user ids or (legacy) usernames
+    id_by_name, name_by_id = user_maps()
+    if user_id not in name_by_id:
+        raise OperationError("User not found", 404)
+    if rotation_user_ids is None:
+        unknown = [name for name in rotation_order if name not in id_by_name]
+        rotation_user_ids = [id_by_name.get(name) for name in rotation_order]
+    else:
+        unknown = [uid for uid in rotation_user_ids if uid not in name_by_id]
+    if unknown:
+        raise OperationError(f"Unknown rotation user(s): {unknown}")
+
+    new_chore = Chore(
+        description=description,
+        user_id=user_id,
+        day=day,
+        rotation_type=rotation_type.lower(),
+        rotation_members=[
+            ChoreRotation(position=pos, user_id=uid)
+            for pos, uid in enumerate(rotation_user_ids)
+        ],
+        base_user_id=user_id if rotation_type.lower() == "rotating" else None
+        )
+    db.session.add(new_chore)
+    db.session.flush()  # assigns the id for the event payload
+
+    # Include the username in the response
+    response = chore_to_dict(new_chore)
+    publish_change("chore.created", response)
+    return response
+
+
+@bp.route('/chores', methods=['POST'])
+def add_chore():
+    try:
+        response = create_chore_op(request.get_json())
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    bump_board_version()
+    db.session.commit()
+    return jsonify(response), 201
+
+
+
+@bp.route('/users', methods=['POST'])
+def create_user():
+    data = request.get_json()
+    username = data.get('username')
+
+    if not username:
+        return jsonify({"error": "Username is required"}), 400
+    
+    # Check if user already exists
+    existing_user = User.query.filter_by(username=username).first()
+    if existing_user:
+        return jsonify({"error": "Username already exists"}), 400
+
+    new_user = User(username=username)
+    db.session.add(new_user)
+    db.session.flush()
+    publish_change("user.created", {"id": new_user.id, "username": new_user.username})
+    db.session.commit()
+    add_config_user(new_user.username)
+
+    return jsonify({"id": new_user.id, "username": new_user.username}), 201
+
+def update_chore_op(id, data):
+    chore = _get_live(Chore, id)
+    if chore is None:
+        raise OperationError("Chore not found", 404)
+
+    description = data.get('description')
+    completed = data.get('completed')
+
+    if description is not None:
+        chore.description = description
+    if completed is not None:
+        chore.completed = completed
+
+    publish_change("chore.updated", chore_to_dict(chore))
+    return {"id": chore.id, "description": chore.description, "completed": chore.completed}
+
+
+@bp.route('/chores/<int:id>', methods=['PUT'])
+def update_chore(id):
+    data = request.get_json()
+    try:
+        response = update_chore_op(id, data)
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    bump_board_version()
+    db.session.commit()
+    return jsonify(response), 201
+
+@bp.route('/chores/<int:id>/toggle', methods=['POST'])
+def toggle_chore(id):
+    """Flip a chore's completed flag server-side in one UPDATE … RETURNING."""
+    row = db.session.execute(
+        db.update(Chore)
+        .where(Chore.id == id)
+        .values(completed=db.not_(db.func.coalesce(Chore.completed, False)))
+        .returning(Chore.id, Chore.completed)
+    ).first()
+    if row is None:
+        return jsonify({"error": "Chore not found"}), 404
+
+    toggled = {"id": row.id, "completed": row.completed}
+    publish_change("chore.toggled", toggled)
+    bump_board_version()
+    db.session.commit()
+    return jsonify(toggled), 200
+
+@bp.route('/chores/archive', methods=['POST'])
+def archive_chores():
+    counts = archive_chores_snapshot(date.today())
+    publish_change("week.reset", {"date": date.today().strftime('%Y-%m-%d')})
+    bump_board_version()
+    db.session.commit()
+    return jsonify({"message": "All chores archived and reset", **counts}), 200
+
+ARCHIVE_PAGE_SIZE = 100
+ARCHIVE_PAGE_MAX = 500
+
+
+def _parse_date_arg(name):
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    return datetime.strptime(raw, '%Y-%m-%d').date()
+
+
+def _archive_cursor(record):
+    return f"{record.date.strftime('%Y-%m-%d')}:{record.id}"
+
+
+def _parse_archive_cursor(cursor):
+    raw_date, raw_id = cursor.split(':', 1)
+    return datetime.strptime(raw_date, '%Y-%m-%d').date(), int(raw_id)
+
+
+@bp.route('/archive', methods=['GET'])
+def get_archive():
+    """Page through ChoreHistory ordered by (date, id).
+
+    Query args: ``from`` / ``to`` (inclusive, YYYY-MM-DD), ``username``,
+    ``chore_id``, ``limit`` and the ``cursor`` returned as ``next_cursor``
+    by the previous page.
+    """
+    try:
+        date_from = _parse_date_arg('from')
+        date_to = _parse_date_arg('to')
+    except ValueError:
+        return jsonify({"error": "Dates must be formatted YYYY-MM-DD"}), 400
+
+    limit = request.args.get('limit', ARCHIVE_PAGE_SIZE, type=int)
+    if limit < 1 or limit > ARCHIVE_PAGE_MAX:
+        return jsonify({"error": f"limit must be between 1 and {ARCHIVE_PAGE_MAX}"}), 400
+
+    query = ChoreHistory.query
+    if date_from:
+        query = query.filter(ChoreHistory.date >= date_from)
+    if date_to:
+        query = query.filter(ChoreHistory.date <= date_to)
+    if request.args.get('username'):
+        query = query.filter(ChoreHistory.username == request.args['username'])
+    if request.args.get('chore_id'):
+        chore_id = request.args.get('chore_id', type=int)
+        if chore_id is None:
+            return jsonify({"error": "chore_id must be an integer"}), 400
+        query = query.filter(ChoreHistory.chore_id == chore_id)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            after_date, after_id = _parse_archive_cursor(cursor)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        # keyset: continue strictly after the last row of the previous page
+        query = query.filter(db.or_(
+            ChoreHistory.date > after_date,
+            db.and_(ChoreHistory.date == after_date, ChoreHistory.id > after_id),
+        ))
+
+    # one extra row tells us whether another page exists
+    rows = query.order_by(ChoreHistory.date, ChoreHistory.id).limit(limit + 1).all()
+    page = rows[:limit]
+
+    history_list = [
+        {
+            "id" : record.id,
+            "chore_id" : record.chore_id,
+            "username" : record.username,
+            "date" : record.date.strftime('%Y-%m-%d'),
+            "completed" : record.completed,
+            "day" : record.day,
+            "rotation_type" : record.rotation_type
+        }
+        for record in page
+    ]
+    return jsonify({
+        "items": history_list,
+        "next_cursor": _archive_cursor(page[-1]) if len(rows) > limit else None,
+    })
+
+@bp.route('/chores/clear-archive', methods=['DELETE'])
+def clear_archive():
+    # Delete all records from the ChoreHistory table (and the stats built on it)
+    ChoreHistory.query.delete()
+    WeeklyRollup.query.delete()
+    db.session.commit()
+    return jsonify({"message": "Chore history cleared successfully"}), 200
+
+
+
+def delete_chore_op(id):
+    chore = _get_live(Chore, id)
+    if chore is None:
+        raise OperationError("Chore not found", 404)
+    
+    # Delete associated ChoreHistory entries
+    ChoreHistory.query.filter_by(chore_id=chore.id).delete()
+
+    db.session.delete(chore)
+    publish_change("chore.deleted", {"id": id})
+    return {"message": "Chore deleted"}
+
+
+@bp.route('/chores/<int:id>', methods=['DELETE'])
+def delete_chore(id):
+    try:
+        response = delete_chore_op(id)
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    bump_board_version()
+    db.session.commit()
+    return jsonify(response), 200
+
+@bp.route('/users', methods=['GET'])
+def get_users():
+    users = User.query.all()
+    user_list = [{"id": user.id, "username": user.username} for user in users]
+    return jsonify(user_list)
+
+@bp.route('/users/<int:id>', methods=['DELETE'])
+def delete_user(id):
+    #Find the user by ID
+    user = User.query.get_or_404(id)
+    #delete all chores associated with this user, with their rotation and history rows
+    owned = db.select(Chore.id).where(Chore.user_id == id)
+    ChoreRotation.query.filter(ChoreRotation.chore_id.in_(owned)).delete(synchronize_session=False)
+    ChoreHistory.query.filter(ChoreHistory.chore_id.in_(owned)).delete(synchronize_session=False)
+    Chore.query.filter_by(user_id=id).delete()
+
+    #drop the user from other rotations; chores anchored on them fall back to their owner
+    ChoreRotation.query.filter_by(user_id=id).delete()
+    Chore.query.filter_by(base_user_id=id).update({"base_user_id": None})
+    WeeklyRollup.query.filter_by(username=user.username).delete()
+    AllowanceLedger.query.filter_by(username=user.username).delete()
+
+    #Delete the User
+    db.session.delete(user)
+    publish_change("user.deleted", {"id": id})
+    bump_board_version()
+    db.session.commit()
+    remove_config_user(user.username)
+
+    return jsonify({"message": f"{user.username} and all their chores have been deleted"}), 200
+
+@bp.app_errorhandler(404)
+def not_found(error):
+    return jsonify({"error": "Resource not found"}), 404
+
+@bp.app_errorhandler(400)
+def bad_request(error):
+    return jsonify({"error": "Bad request"}), 400
+
+@bp.route('/chores/reset', methods=['POST'])
+def manual_weekly_reset():
+    body        = request.get_json(silent=True) or {}
+    send_flag   = bool(body.get("generate_reports"))
+
+    # run the same weekly task; today's snapshot rows are upserted in place
+    weekly_archive_task(send_reports=send_flag, force=True)
+
+    return jsonify({
+        "message": "Week archived & rotated",
+        "reports_sent": send_flag,
+        "date": str(date.today())
+    }), 200
+
+def move_chore_op(id, data):
+    chore = _get_live(Chore, id)
+    if chore is None:
+        raise OperationError("Chore not found", 404)
+    new_user_id = data.get('user_id')
+    new_day = data.get('day')
+
+    if new_day and new_day not in VALID_DAYS:
+        raise OperationError("Invalid day provided")
+
+    if new_user_id is not None:
+        user = _get_live(User, new_user_id)
+        if not user:
+            raise OperationError("User not found", 404)
+        chore.user_id = new_user_id
+        # For rotating chores, do NOT update base_user_id on drag
+    if new_day:
+        chore.day = new_day
+
+    db.session.flush()  # so chore.user follows the new user_id
+    db.session.expire(chore, ['user'])
+    publish_change("chore.moved", chore_to_dict(chore))
+    return {
+        "id": chore.id,
+        "description": chore.description,
+        "user_id": chore.user_id,
+        "username": chore.user.username,
+        "day": chore.day
+    }
+
+
+@bp.route('/chores/<int:id>/move', methods=['PUT'])
+def move_chore(id):
+    try:
+        response = move_chore_op(id, request.get_json())
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    bump_board_version()
+    db.session.commit()
+    return jsonify(response), 200
+
+# ---- Rotation Endpoints ----
+
+ROTATION_FORECAST_MAX_WEEKS = 52
+
+@bp.route('/rotation/forecast', methods=['GET'])
+def rotation_forecast():
+    """Project who owns each rotating chore for the next ``weeks`` rotations."""
+    weeks = request.args.get('weeks', 4, type=int)
+    if weeks < 1 or weeks > ROTATION_FORECAST_MAX_WEEKS:
+        return jsonify({"error": f"weeks must be between 1 and {ROTATION_FORECAST_MAX_WEEKS}"}), 400
+
+    _, name_by_id = user_maps()
+    members_by_chore = rotation_members()
+    rotating = (
+        Chore.query.filter_by(rotation_type="rotating").order_by(Chore.id).all()
+    )
+    first_date = next_rotation_date()
+
+    forecast = []
+    for chore in rotating:
+        members = members_by_chore.get(chore.id, [])
+        pos = rotation_index(members, chore.base_user_id or chore.user_id)
+        weeks_out = []
+        for week in range(1, weeks + 1):
+            # chores whose anchor is outside the rotation never move
+            owner_id = chore.user_id if pos is None else members[(pos + week) % len(members)]
+            weeks_out.append({
+                "week": week,
+                "date": (first_date + timedelta(weeks=week - 1)).strftime('%Y-%m-%d'),
+                "user_id": owner_id,
+                "username": name_by_id.get(owner_id),
+            })
+        forecast.append({
+            "id": chore.id,
+            "description": chore.description,
+            "day": chore.day,
+            "current_username": name_by_id.get(chore.user_id),
+            "rotation_order": [name_by_id[uid] for uid in members],
+            "forecast": weeks_out,
+        })
+
+    return jsonify({"weeks": weeks, "chores": forecast})
+
+# ---- Grocery List Endpoints ----
+
+@bp.route('/grocery', methods=['GET'])
+def get_grocery():
+    items = GroceryItem.query.order_by(GroceryItem.created_at).all()
+    return jsonify([grocery_to_dict(i) for i in items])
+
+def add_grocery_op(data):
+    item_name = data.get('item_name', '').strip()
+    added_by = data.get('added_by', '').strip()
+    if not item_name or not added_by:
+        raise OperationError("item_name and added_by are required")
+    item = GroceryItem(item_name=item_name, added_by=added_by)
+    db.session.add(item)
+    db.session.flush()
+    publish_change("grocery.added", grocery_to_dict(item))
+    return {"id": item.id, "item_name": item.item_name, "added_by": item.added_by}
+
+
+@bp.route('/grocery', methods=['POST'])
+def add_grocery():
+    try:
+        response = add_grocery_op(request.get_json())
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    db.session.commit()
+    return jsonify(response), 201
+
+
+def remove_grocery_op(id):
+    item = _get_live(GroceryItem, id)
+    if item is None:
+        raise OperationError("Item not found", 404)
+    db.session.delete(item)
+    publish_change("grocery.removed", {"id": id})
+    return {"message": "Item deleted"}
+
+
+@bp.route('/grocery/<int:id>', methods=['DELETE'])
+def delete_grocery(id):
+    try:
+        response = remove_grocery_op(id)
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+    db.session.commit()
+    return jsonify(response), 200
+
+@bp.route('/grocery/clear', methods=['DELETE'])
+def clear_grocery():
+    GroceryItem.query.delete()
+    publish_change("grocery.cleared", {})
+    db.session.commit()
+    return jsonify({"message": "Grocery list cleared"}), 200
+
+@bp.route('/grocery/send', methods=['POST'])
+def send_grocery():
+    from .reporting import _load_config
+    from email.message import EmailMessage
+    from . import outbox
+
+    data = request.get_json()
+    recipient = data.get('recipient_username', '').strip()
+    if not recipient:
+        return jsonify({"error": "recipient_username is required"}), 400
+
+    cfg = _load_config()
+    user_block = cfg.get(recipient)
+    if not user_block or not user_block.get('email'):
+        return jsonify({"error": f"No email configured for {recipient}"}), 400
+
+    items = GroceryItem.query.order_by(GroceryItem.created_at).all()
+    if not items:
+        return jsonify({"error": "Grocery list is empty"}), 400
+
+    lines = ["Grocery List", "=" * 30, ""]
+    for i in items:
+        lines.append(f"  - {i.item_name}  (added by {i.added_by})")
+    lines.append("")
+    lines.append("-- Family Hub")
+
+    msg = EmailMessage()
+    msg["Subject"] = "Grocery List from Family Hub"
+    msg["To"] = user_block['email']
+    msg.set_content("\n".join(lines))
+
+    # Queue the email and clear the list in one transaction; the outbox
+    # worker sends it in the background
+    [outbox_id] = outbox.enqueue(db.session, [outbox.message_payload(msg)])
+    GroceryItem.query.delete()
+    publish_change("grocery.cleared", {})
+    db.session.commit()
+    outbox.wake()
+
+    return jsonify({"message": f"Grocery list queued for {recipient}",
+                    "outbox_id": outbox_id}), 202
+
+@bp.route('/outbox/<int:id>', methods=['GET'])
+def get_outbox_message(id):
+    message = EmailOutbox.query.get_or_404(id)
+    return jsonify({
+        "id": message.id,
+        "status": message.status,
+        "attempts": message.attempts,
+        "last_error": message.last_error,
+        "created_at": message.created_at.isoformat(),
+        "sent_at": message.sent_at.isoformat() if message.sent_at else None,
+    })
+
+# ---- Stats Endpoints ----
+# read only from weekly_rollup, never from the raw ChoreHistory rows
+
+STATS_DEFAULT_WEEKS = 12
+STATS_MAX_WEEKS = 520
+WEEKDAY_ORDER = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _stats_query(*columns):
+    """Select *columns* from WeeklyRollup limited by ``weeks``/``username`` args."""
+    weeks = request.args.get('weeks', STATS_DEFAULT_WEEKS, type=int)
+    if weeks is None or weeks < 1 or weeks > STATS_MAX_WEEKS:
+        raise OperationError(f"weeks must be between 1 and {STATS_MAX_WEEKS}")
+    recent = (
+        db.select(WeeklyRollup.snapshot_date).distinct()
+        .order_by(WeeklyRollup.snapshot_date.desc()).limit(weeks)
+    )
+    query = db.select(*columns).where(WeeklyRollup.snapshot_date.in_(recent))
+    if request.args.get('username'):
+        query = query.where(WeeklyRollup.username == request.args['username'])
+    return query
+
+
+def _rate(completed, total):
+    return round(completed / total, 4) if total else 0.0
+
+
+@bp.route('/stats/weekly', methods=['GET'])
+def stats_weekly():
+    """Completion rate per user per snapshot, oldest first."""
+    try:
+        query = _stats_query(
+            WeeklyRollup.username, WeeklyRollup.snapshot_date,
+            db.func.sum(WeeklyRollup.total), db.func.sum(WeeklyRollup.completed),
+        )
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+
+    users = {}
+    for username, snapshot_date, total, completed in db.session.execute(
+        query.group_by(WeeklyRollup.username, WeeklyRollup.snapshot_date)
+        .order_by(WeeklyRollup.username, WeeklyRollup.snapshot_date)
+    ):
+        users.setdefault(username, []).append({
+            "snapshot": snapshot_date.strftime('%Y-%m-%d'),
+            "total": total,
+            "completed": completed,
+            "rate": _rate(completed, total),
+        })
+    return jsonify({"users": users})
+
+
+@bp.route('/stats/weekday', methods=['GET'])
+def stats_weekday():
+    """Completion rate per user per weekday over the selected weeks."""
+    try:
+        query = _stats_query(
+            WeeklyRollup.username, WeeklyRollup.day,
+            db.func.sum(WeeklyRollup.total), db.func.sum(WeeklyRollup.completed),
+        )
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+
+    users = {}
+    for username, day, total, completed in db.session.execute(
+        query.group_by(WeeklyRollup.username, WeeklyRollup.day)
+    ):
+        users.setdefault(username, {})[day] = {
+            "total": total,
+            "completed": completed,
+            "rate": _rate(completed, total),
+        }
+    return jsonify({"users": {
+        name: [{"day": d, **days[d]} for d in WEEKDAY_ORDER if d in days]
+        for name, days in users.items()
+    }})
+
+
+@bp.route('/stats/streaks', methods=['GET'])
+def stats_streaks():
+    """Current and longest runs of snapshots with every chore completed.
+
+    Snapshots in which a user had no chores neither extend nor break a streak.
+    """
+    try:
+        query = _stats_query(
+            WeeklyRollup.username, WeeklyRollup.snapshot_date,
+            db.func.sum(WeeklyRollup.total), db.func.sum(WeeklyRollup.completed),
+        )
+    except OperationError as err:
+        return jsonify({"error": str(err)}), err.status
+
+    streaks = {}
+    for username, snapshot_date, total, completed in db.session.execute(
+        query.group_by(WeeklyRollup.username, WeeklyRollup.snapshot_date)
+        .order_by(WeeklyRollup.username, WeeklyRollup.snapshot_date)
+    ):
+        entry = streaks.setdefault(username, {"current": 0, "longest": 0, "last_perfect": None})
+        if total and completed == total:
+            entry["current"] += 1
+            entry["longest"] = max(entry["longest"], entry["current"])
+            entry["last_perfect"] = snapshot_date.strftime('%Y-%m-%d')
+        else:
+            entry["current"] = 0
+    return jsonify({"users": streaks})
+
+# ---- Allowance Endpoints ----
+
+ALLOWANCE_PAGE_SIZE = 52
+
+
+@bp.route('/allowance/<username>', methods=['GET'])
+def get_allowance(username):
+    """Running balance and per-snapshot history from the allowance ledger.
+
+    ``limit`` caps the history (newest first); ``balance`` always covers
+    every recorded week.
+    """
+    limit = request.args.get('limit', ALLOWANCE_PAGE_SIZE, type=int)
+    if limit is None or limit < 1 or limit > STATS_MAX_WEEKS:
+        return jsonify({"error": f"limit must be between 1 and {STATS_MAX_WEEKS}"}), 400
+
+    running = db.func.sum(AllowanceLedger.amount).over(order_by=AllowanceLedger.snapshot_date)
+    rows = db.session.execute(
+        db.select(AllowanceLedger, running.label('balance'))
+        .where(AllowanceLedger.username == username)
+        .order_by(AllowanceLedger.snapshot_date.desc())
+        .limit(limit)
+    ).all()
+    if not rows:
+        return jsonify({"error": "No allowance recorded for this user"}), 404
+
+    return jsonify({
+        "username": username,
+        "balance": round(rows[0].balance, 2),
+        "history": [
+            {
+                "snapshot": entry.snapshot_date.strftime('%Y-%m-%d'),
+                "total": entry.total,
+                "completed": entry.completed,
+                "tier": entry.tier,
+                "amount": entry.amount,
+                "configured_amount": entry.configured_amount,
+                "balance": round(balance, 2),
+            }
+            for entry, balance in rows
+        ],
+    })
+
+# ---- Report Endpoints ----
+
+@bp.route('/reports/preview', methods=['GET'])
+def preview_reports():
+    """The weekly reports for the latest snapshot, computed but not sent."""
+    started = time.perf_counter()
+    with read_snapshot() as session:
+        latest, reports = build_weekly_reports(session)
+    if latest is None:
+        return jsonify({"snapshot": None, "reports": []})
+
+    return jsonify({
+        "snapshot": latest.isoformat(),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        "reports": [
+            {
+                "user": r["user"],
+                "email": r["email"],
+                "send": r["send"],
+                "total": r["stats"].total,
+                "completed": r["stats"].completed,
+                "pct": round(r["stats"].pct, 4),
+                "allowance": r["allowance"],
+                "chores": r["chores"],
+            }
+            for r in reports
+        ],
+    })
+
+# ---- Batch Endpoint ----
+
+BATCH_MAX_OPERATIONS = 200
+
+def _op_id(operation):
+    if not isinstance(operation.get('id'), int):
+        raise OperationError("id must be an integer")
+    return operation['id']
+
+
+def _op_data(operation):
+    data = operation.get('data') or {}
+    if not isinstance(data, dict):
+        raise OperationError("data must be an object")
+    return data
+
+
+# op name -> (runner, success status, touches the chore board)
+BATCH_OPERATIONS = {
+    "create_chore": (lambda op: create_chore_op(_op_data(op)), 201, True),
+    "update_chore": (lambda op: update_chore_op(_op_id(op), _op_data(op)), 201, True),
+    "move_chore": (lambda op: move_chore_op(_op_id(op), _op_data(op)), 200, True),
+    "delete_chore": (lambda op: delete_chore_op(_op_id(op)), 200, True),
+    "add_grocery": (lambda op: add_grocery_op(_op_data(op)), 201, False),
+    "remove_grocery": (lambda op: remove_grocery_op(_op_id(op)), 200, False),
+}
+
+
+@bp.route('/batch', methods=['POST'])
+def batch():
+    """Apply an ordered list of operations in one transaction.
+
+    Body: ``{"operations": [{"op": "move_chore", "id": 3, "data": {...}}, ...]}``.
+    Every operation is validated like its single route; the first failure
+    rolls the whole batch back and is reported with its index.
+    """
+    body = request.get_json(silent=True) or {}
+    operations = body.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return jsonify({"error": "operations must be a non-empty list"}), 400
+    if len(operations) > BATCH_MAX_OPERATIONS:
+        return jsonify({"error": f"At most {BATCH_MAX_OPERATIONS} operations per batch"}), 400
+
+    results = []
+    touches_board = False
+    for index, operation in enumerate(operations):
+        name = operation.get('op') if isinstance(operation, dict) else None
+        try:
+            if name not in BATCH_OPERATIONS:
+                raise OperationError(f"Unknown op: {name}")
+            runner, status, board = BATCH_OPERATIONS[name]
+            result = runner(operation)
+        except OperationError as err:
+            db.session.rollback()
+            return jsonify({
+                "error": str(err),
+                "index": index,
+                "op": name,
+                "status": err.status,
+            }), 400
+        touches_board = touches_board or board
+        results.append({"index": index, "op": name, "status": status, "result": result})
+
+    if touches_board:
+        bump_board_version()
+    db.session.commit()
+    return jsonify({"results": results}), 200
+
+# ---- Export Endpoints ----
+# rows are streamed from a server-side cursor in EXPORT_BATCH_ROWS chunks,
+# so memory stays flat no matter how long the archive gets
+
+EXPORT_BATCH_ROWS = 500
+EXPORT_MIMETYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _export_response(stmt, fields, fmt, filename):
+    """Stream the rows of *stmt* as CSV (with a header) or NDJSON."""
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(fields)
+        with read_snapshot() as session:
+            result = session.execute(stmt.execution_options(yield_per=EXPORT_BATCH_ROWS))
+            for partition in result.partitions():
+                for row in partition:
+                    values = [_export_value(v) for v in row]
+                    if writer:
+                        writer.writerow(values)
+                    else:
+                        buffer.write(json.dumps(dict(zip(fields, values))) + "\n")
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return current_app.response_class(
+        stream_with_context(generate()),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@bp.route('/export/history.<any(csv, ndjson):fmt>', methods=['GET'])
+def export_history(fmt):
+    """Every ChoreHistory row ordered by (date, id).
+
+    Query args: ``from`` / ``to`` (inclusive, YYYY-MM-DD) and ``username``.
+    """
+    try:
+        date_from = _parse_date_arg('from')
+        date_to = _parse_date_arg('to')
+    except ValueError:
+        return jsonify({"error": "Dates must be formatted YYYY-MM-DD"}), 400
+
+    fields = ["id", "chore_id", "username", "date", "completed", "day", "rotation_type"]
+    stmt = db.select(*(getattr(ChoreHistory, name) for name in fields))
+    if date_from:
+        stmt = stmt.where(ChoreHistory.date >= date_from)
+    if date_to:
+        stmt = stmt.where(ChoreHistory.date <= date_to)
+    if request.args.get('username'):
+        stmt = stmt.where(ChoreHistory.username == request.args['username'])
+    stmt = stmt.order_by(ChoreHistory.date, ChoreHistory.id)
+    return _export_response(stmt, fields, fmt, "chore_history")
+
+
+@bp.route('/export/grocery.<any(csv, ndjson):fmt>', methods=['GET'])
+def export_grocery(fmt):
+    """Grocery items ordered by creation time; ``from`` / ``to`` filter on created_at."""
+    try:
+        date_from = _parse_date_arg('from')
+        date_to = _parse_date_arg('to')
+    except ValueError:
+        return jsonify({"error": "Dates must be formatted YYYY-MM-DD"}), 400
+
+    fields = ["id", "item_name", "added_by", "created_at"]
+    stmt = db.select(*(getattr(GroceryItem, name) for name in fields))
+    if date_from:
+        stmt = stmt.where(GroceryItem.created_at >= datetime.combine(date_from, datetime.min.time()))
+    if date_to:
+        stmt = stmt.where(GroceryItem.created_at < datetime.combine(date_to + timedelta(days=1), datetime.min.time()))
+    stmt = stmt.order_by(GroceryItem.created_at, GroceryItem.id)
+    return _export_response(stmt, fields, fmt, "grocery")
+
+# ---- Metrics Endpoint ----
+
+@bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus scrape target: every worker's series, labelled pid (see metrics.py)."""
+    return current_app.response_class(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# ---- Change Feed (Server-Sent Events) ----
+
+SSE_POLL_SECONDS = 1.0
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _sse(kind, data, event_id=None):
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {kind}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+@bp.route('/events', methods=['GET'])
+def change_events():
+    """Stream ChangeEvent rows as Server-Sent Events.
+
+    Browsers resume with the ``Last-Event-ID`` header after a disconnect
+    (``?last_event_id=`` works too). A fresh connection starts at the
+    current version and announces it with a ``ready`` event; a resume
+    point that has been pruned gets ``reset`` so the client reloads.
+    """
+    raw_last = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+
+    def stream():
+        # a short-lived connection per poll, so idle streams hold no pool slot
+        with db.engine.connect() as conn:
+            oldest, newest = conn.execute(
+                db.select(db.func.min(ChangeEvent.id), db.func.max(ChangeEvent.id))
+            ).one()
+        newest = newest or 0
+        last_id = int(raw_last) if raw_last and raw_last.isdigit() else None
+
+        yield "retry: 3000\n\n"
+        if last_id is None:
+            last_id = newest
+            yield _sse("ready", {"version": newest}, newest)
+        elif last_id > newest or (oldest is not None and last_id < oldest - 1):
+            last_id = newest
+            yield _sse("reset", {"version": newest}, newest)
+
+        idle = 0.0
+        while True:
+            with db.engine.connect() as conn:
+                rows = conn.execute(
+                    db.select(ChangeEvent.id, ChangeEvent.kind, ChangeEvent.payload)
+                    .where(ChangeEvent.id > last_id)
+                    .order_by(ChangeEvent.id)
+                ).all()
+            for event_id, kind, payload in rows:
+                last_id = event_id
+                yield _sse(kind, payload, event_id)
+            if rows:
+                idle = 0.0
+            elif idle >= SSE_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            time.sleep(SSE_POLL_SECONDS)
+            idle += SSE_POLL_SECONDS
+
+    return current_app.response_class(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
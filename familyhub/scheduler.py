@@ -0,0 +1,363 @@
+# familyhub/scheduler.py  – weekly archive / rotation, maintenance jobs and their CLI
+"""Cron jobs and the archive, rollup and rotation logic they run.
+
+Jobs are registered with :func:`cron` at import time, but APScheduler
+itself is only imported by :func:`start`, i.e. in serving processes;
+CLI commands, migrations and ``reporting.py`` never pay for it.  Job
+functions expect an app context: :func:`start` wraps them in one, the
+routes and CLI commands already have one.
+"""
+import functools
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from . import metrics
+from .extensions import db, read_snapshot
+from .leader import LeaderLock
+from .models import (
+    AllowanceLedger, ChangeEvent, Chore, ChoreHistory, ChoreRotation, User, WeeklyRollup,
+    CHANGE_EVENT_RETENTION, bump_board_version, publish_change,
+)
+from .reporting import (
+    SnapshotStats, allowance_tier, calc_allowance, configured_allowances, generate_weekly_reports,
+)
+
+# job id -> (function, cron trigger fields); added to APScheduler by start()
+CRON_JOBS = {}
+
+
+def cron(job_id, **trigger):
+    """Register the decorated function as the cron job *job_id*."""
+    def register(func):
+        CRON_JOBS[job_id] = (func, trigger)
+        return func
+    return register
+
+
+def _with_app_context(app, func):
+    @functools.wraps(func)
+    def job(*args, **kwargs):
+        with app.app_context():
+            return func(*args, **kwargs)
+    return job
+
+
+def start(app):
+    """Schedule CRON_JOBS and run them here if this process wins the leader lock.
+
+    Every worker registers the jobs and the scheduler API, but only the
+    process holding SCHEDULER_LOCK_FILE starts the scheduler; if it dies,
+    another worker picks the lock up within LeaderLock.poll_seconds.
+    """
+    from flask_apscheduler import APScheduler  # serving processes only
+
+    scheduler = APScheduler()
+    scheduler.api_enabled = True
+    scheduler.init_app(app)
+    for job_id, (func, trigger) in CRON_JOBS.items():
+        scheduler.add_job(job_id, _with_app_context(app, func), trigger='cron', **trigger)
+    leader = LeaderLock(app.config['SCHEDULER_LOCK_FILE'], on_elected=scheduler.start)
+    app.extensions['scheduler_leader'] = leader
+    leader.start()
+    return scheduler
+
+
+@cron('weekly_archive', day_of_week='mon', hour=0, minute=0, misfire_grace_time=60, coalesce=True, max_instances=1)
+@metrics.timed_job('weekly_archive')
+def weekly_archive_task(*, send_reports: bool = True, force: bool = False):
+    today = date.today()
+    # rotation is not idempotent, so a misfired re-run must stop here;
+    # manual resets pass force=True and overwrite today's snapshot.
+    if not force and ChoreHistory.query.filter_by(date=today).first():
+        print(f"Archive for {today} already exists; skipping.")
+        return
+
+    # 1. archive + reset status
+    counts = archive_chores_snapshot(today)
+
+    # 2. advance rotating chores
+    rotate_chores_once()
+
+    bump_board_version()
+    publish_change("week.reset", {"date": today.strftime('%Y-%m-%d')})
+    ChangeEvent.query.filter(
+        ChangeEvent.created_at < datetime.utcnow() - CHANGE_EVENT_RETENTION
+    ).delete()
+    db.session.commit()
+
+    if send_reports:
+        with read_snapshot() as session:
+            generate_weekly_reports(session)
+
+    print(f"Archive+rotation complete – {today} "
+          f"({counts['archived']} archived, {counts['reset']} reset)")
+    return counts
+
+
+def archive_chores_snapshot(snapshot_date):
+    """Copy every chore into ChoreHistory and clear completion flags.
+
+    Runs as one INSERT … SELECT plus one UPDATE, so the number of
+    round-trips does not grow with the number of chores. Rows already
+    archived for *snapshot_date* are overwritten via the unique
+    (chore_id, date) index, which makes re-runs safe. The caller owns the
+    commit. Returns the affected row counts.
+    """
+    snapshot = (
+        db.select(
+            Chore.id,
+            User.username,
+            db.literal(snapshot_date, db.Date),
+            db.func.coalesce(Chore.completed, False),
+            Chore.day,
+            Chore.rotation_type,
+        )
+        .join(User, User.id == Chore.user_id)
+        # SQLite needs a WHERE on INSERT … SELECT before an ON CONFLICT clause
+        .where(db.true())
+    )
+    upsert = sqlite_insert(ChoreHistory).from_select(
+        ['chore_id', 'username', 'date', 'completed', 'day', 'rotation_type'],
+        snapshot,
+    )
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[ChoreHistory.chore_id, ChoreHistory.date],
+        set_={
+            "username": upsert.excluded.username,
+            "completed": upsert.excluded.completed,
+            "day": upsert.excluded.day,
+            "rotation_type": upsert.excluded.rotation_type,
+        },
+    )
+    archived = db.session.execute(upsert).rowcount
+    refresh_weekly_rollup([snapshot_date])
+    record_allowances(snapshot_date)
+    reset = db.session.execute(
+        db.update(Chore).where(Chore.completed.is_(True)).values(completed=False)
+    ).rowcount
+    return {"archived": archived, "reset": reset}
+
+
+def refresh_weekly_rollup(snapshot_dates=None):
+    """Rebuild WeeklyRollup rows for *snapshot_dates* (all dates if None).
+
+    One DELETE plus one INSERT … SELECT … GROUP BY over the matching
+    ChoreHistory rows; the caller owns the commit. Rollup rows are kept
+    when a chore is deleted, and rows whose raw history was compacted
+    away are never touched. Returns the number of rollup rows written.
+    """
+    stale = db.delete(WeeklyRollup).where(
+        WeeklyRollup.snapshot_date.in_(db.select(ChoreHistory.date).distinct())
+    )
+    grouped = (
+        db.select(
+            ChoreHistory.username,
+            ChoreHistory.date,
+            ChoreHistory.day,
+            db.func.count(ChoreHistory.id),
+            db.func.sum(db.case((ChoreHistory.completed, 1), else_=0)),
+        )
+        .group_by(ChoreHistory.username, ChoreHistory.date, ChoreHistory.day)
+    )
+    if snapshot_dates is not None:
+        stale = stale.where(WeeklyRollup.snapshot_date.in_(snapshot_dates))
+        grouped = grouped.where(ChoreHistory.date.in_(snapshot_dates))
+    db.session.execute(stale)
+    return db.session.execute(
+        db.insert(WeeklyRollup).from_select(
+            ['username', 'snapshot_date', 'day', 'total', 'completed'], grouped
+        )
+    ).rowcount
+
+
+def record_allowances(snapshot_date):
+    """Write the AllowanceLedger rows for *snapshot_date*.
+
+    Stats come from the WeeklyRollup rows just built for that date and the
+    amount from the current reporting config, so later config edits never
+    change what a past week paid. Re-archiving the same date overwrites
+    its rows. The caller owns the commit.
+    """
+    configured = configured_allowances()
+    rows = []
+    for username, total, completed in db.session.execute(
+        db.select(
+            WeeklyRollup.username,
+            db.func.sum(WeeklyRollup.total),
+            db.func.sum(WeeklyRollup.completed),
+        )
+        .where(WeeklyRollup.snapshot_date == snapshot_date)
+        .group_by(WeeklyRollup.username)
+    ):
+        stats = SnapshotStats(total=total, completed=completed)
+        full_amount = configured.get(username, 0)
+        rows.append({
+            "username": username,
+            "snapshot_date": snapshot_date,
+            "total": total,
+            "completed": completed,
+            "tier": allowance_tier(stats),
+            "amount": calc_allowance(stats, full_amount),
+            "configured_amount": full_amount,
+            "created_at": datetime.utcnow(),
+        })
+    if not rows:
+        return 0
+    upsert = sqlite_insert(AllowanceLedger).values(rows)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[AllowanceLedger.username, AllowanceLedger.snapshot_date],
+        set_={
+            col: getattr(upsert.excluded, col)
+            for col in ("total", "completed", "tier", "amount", "configured_amount", "created_at")
+        },
+    )
+    return db.session.execute(upsert).rowcount
+
+
+def compact_history(retention_weeks=None, today=None):
+    """Fold ChoreHistory older than *retention_weeks* into WeeklyRollup.
+
+    *retention_weeks* defaults to the ``HISTORY_RETENTION_WEEKS`` setting,
+    which is 0 (keep everything) unless a deployment opts in.
+
+    The per-user / per-week / per-day counts are (re)built for every
+    expiring snapshot first, then the raw rows are deleted, so /stats and
+    the allowance ledger keep their numbers while /archive only lists the
+    retained weeks. The caller owns the commit.
+    """
+    if retention_weeks is None:
+        retention_weeks = current_app.config['HISTORY_RETENTION_WEEKS']
+    if retention_weeks <= 0:
+        return {"compacted": 0, "deleted": 0}
+    cutoff = (today or date.today()) - timedelta(weeks=retention_weeks)
+    expiring = db.session.execute(
+        db.select(ChoreHistory.date).distinct().where(ChoreHistory.date < cutoff)
+    ).scalars().all()
+    if not expiring:
+        return {"compacted": 0, "deleted": 0}
+    refresh_weekly_rollup(expiring)
+    deleted = db.session.execute(
+        db.delete(ChoreHistory).where(ChoreHistory.date < cutoff)
+    ).rowcount
+    return {"compacted": len(expiring), "deleted": deleted}
+
+
+@cron('db_maintenance', day_of_week='mon', hour=3, minute=0, misfire_grace_time=3600, coalesce=True, max_instances=1)
+@metrics.timed_job('db_maintenance')
+def db_maintenance_task():
+    """Weekly: apply history retention, refresh planner stats, return free pages."""
+    counts = compact_history()
+    db.session.commit()
+
+    with db.engine.connect() as conn:
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+            conn.exec_driver_sql("PRAGMA optimize")
+            conn.commit()
+            # no-op unless the file is in auto_vacuum=INCREMENTAL mode; it
+            # frees one page per step and pysqlite's execute() steps only
+            # once, so go through executescript()
+            conn.connection.driver_connection.executescript("PRAGMA incremental_vacuum")
+            freelist = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            # fold the WAL back in so the file on disk actually shrinks
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+        else:
+            freelist = None
+
+    print(f"DB maintenance complete – {counts['compacted']} snapshot(s) compacted, "
+          f"{counts['deleted']} history rows removed, {freelist} free pages left")
+    return counts
+
+
+def init_app(app):
+    """Register the maintenance CLI commands on *app*."""
+
+    @app.cli.command('db-maintenance')
+    def db_maintenance_command():
+        """Run the weekly retention + SQLite maintenance job now."""
+        db_maintenance_task()
+
+    @app.cli.command('backfill-rollup')
+    def backfill_rollup_command():
+        """Rebuild the weekly_rollup table from all existing ChoreHistory."""
+        written = refresh_weekly_rollup()
+        db.session.commit()
+        print(f"weekly_rollup rebuilt – {written} rows")
+
+    @app.cli.command('backfill-allowance')
+    def backfill_allowance_command():
+        """Record ledger rows for archived snapshots that have none yet.
+
+        Past weeks are priced with the *current* config allowances.
+        """
+        recorded = db.select(AllowanceLedger.snapshot_date)
+        missing = db.session.execute(
+            db.select(WeeklyRollup.snapshot_date).distinct()
+            .where(WeeklyRollup.snapshot_date.not_in(recorded))
+            .order_by(WeeklyRollup.snapshot_date)
+        ).scalars().all()
+        written = sum(record_allowances(snapshot_date) for snapshot_date in missing)
+        db.session.commit()
+        print(f"allowance_ledger backfilled – {written} rows over {len(missing)} snapshot(s)")
+
+
+def user_maps():
+    """Return ``({username: id}, {id: username})`` from a single query."""
+    rows = db.session.query(User.id, User.username).all()
+    return {name: uid for uid, name in rows}, {uid: name for uid, name in rows}
+
+
+def rotation_members():
+    """Return ``{chore_id: [user_id, ...]}`` for rotating chores, in order."""
+    rows = (
+        db.session.query(ChoreRotation.chore_id, ChoreRotation.user_id)
+        .join(Chore, Chore.id == ChoreRotation.chore_id)
+        .filter(Chore.rotation_type == "rotating")
+        .order_by(ChoreRotation.chore_id, ChoreRotation.position)
+        .all()
+    )
+    members = {}
+    for chore_id, user_id in rows:
+        members.setdefault(chore_id, []).append(user_id)
+    return members
+
+
+def rotation_index(members, anchor_id):
+    """Position of *anchor_id* in *members*, or None if it is not a member."""
+    try:
+        return members.index(anchor_id)
+    except ValueError:
+        return None
+
+
+def rotate_chores_once():
+    members_by_chore = rotation_members()
+    anchors = (
+        db.session.query(Chore.id, Chore.user_id, Chore.base_user_id)
+        .filter(Chore.id.in_(list(members_by_chore)))
+        .all()
+    )
+
+    updates = []
+    for chore_id, user_id, base_user_id in anchors:
+        members = members_by_chore[chore_id]
+        # Use base_user_id (rotation anchor) to determine position
+        pos = rotation_index(members, base_user_id or user_id)
+        if pos is None:
+            continue  # anchor user not in the rotation
+        next_id = members[(pos + 1) % len(members)]
+        updates.append({"id": chore_id, "user_id": next_id, "base_user_id": next_id})
+
+    if updates:
+        # executemany UPDATE … WHERE id = ? for all rotating chores at once
+        db.session.execute(db.update(Chore), updates)
+    return len(updates)
+
+
+def next_rotation_date(today=None):
+    """Date of the next Monday-midnight archive run."""
+    today = today or date.today()
+    return today + timedelta(days=7 - today.weekday())
+
@@ -0,0 +1,29 @@
+# gunicorn.conf.py  – multi-worker production server settings
+#
+#   gunicorn -c gunicorn.conf.py
+#
+# The master migrates the database once (on_starting) before any worker
+# forks.  Every worker then imports wsgi:app, so each one gets its own
+# DB connections and outbox threads; only the scheduler leader (see
+# familyhub/leader.py) runs the cron jobs.
+import os
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_WORKERS", "2"))
+# gthread: /events keeps one thread per open dashboard, so leave headroom
+worker_class = "gthread"
+threads = int(os.getenv("WEB_THREADS", "8"))
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = "-" if os.getenv("ACCESS_LOG") else None
+
+
+def on_starting(server):
+    # once, before the fork: workers never create or alter the schema
+    from familyhub import create_app, upgrade_db
+    from familyhub.config import load_env
+
+    load_env()
+    upgrade_db(create_app(web=False))
@@ -0,0 +1,29 @@
+"""add board_state
+
+Revision ID: 3c7d2a9f51b0
+Revises: 14a4d39f7b23
+Create Date: 2026-10-17 09:12:40.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7d2a9f51b0'
+down_revision = '14a4d39f7b23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('board_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute("INSERT INTO board_state (id, version) VALUES (1, 1)")
+
+
+def downgrade():
+    op.drop_table('board_state')
@@ -0,0 +1,72 @@
+"""add chore_rotation, replacing chore.rotation_order
+
+Revision ID: 5e93c1a8d720
+Revises: b52f0d7e9a41
+Create Date: 2026-10-17 13:48:51.204417
+
+"""
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+# revision identifiers, used by Alembic.
+revision = '5e93c1a8d720'
+down_revision = 'b52f0d7e9a41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    chore_rotation = op.create_table('chore_rotation',
+    sa.Column('chore_id', sa.Integer(), nullable=False),
+    sa.Column('position', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['chore_id'], ['chore.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('chore_id', 'position')
+    )
+    with op.batch_alter_table('chore_rotation', schema=None) as batch_op:
+        batch_op.create_index('ix_chore_rotation_user_id', ['user_id'], unique=False)
+
+    # convert the JSON username lists; names that no longer match a user
+    # were already dead entries and are dropped
+    bind = op.get_bind()
+    id_by_name = {name: uid for uid, name in bind.execute(sa.text('SELECT id, username FROM user'))}
+    rows = []
+    for chore_id, raw in bind.execute(sa.text(
+            'SELECT id, rotation_order FROM chore WHERE rotation_order IS NOT NULL')):
+        names = json.loads(raw) if isinstance(raw, str) else raw
+        user_ids = [id_by_name[name] for name in names or [] if name in id_by_name]
+        rows.extend(
+            {'chore_id': chore_id, 'position': pos, 'user_id': uid}
+            for pos, uid in enumerate(user_ids)
+        )
+    if rows:
+        op.bulk_insert(chore_rotation, rows)
+
+    with op.batch_alter_table('chore', schema=None) as batch_op:
+        batch_op.drop_column('rotation_order')
+
+
+def downgrade():
+    with op.batch_alter_table('chore', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('rotation_order', sqlite.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    orders = {}
+    for chore_id, username in bind.execute(sa.text(
+            'SELECT r.chore_id, u.username FROM chore_rotation r '
+            'JOIN user u ON u.id = r.user_id ORDER BY r.chore_id, r.position')):
+        orders.setdefault(chore_id, []).append(username)
+    for chore_id, names in orders.items():
+        bind.execute(
+            sa.text('UPDATE chore SET rotation_order = :order WHERE id = :id'),
+            {'order': json.dumps(names), 'id': chore_id},
+        )
+
+    with op.batch_alter_table('chore_rotation', schema=None) as batch_op:
+        batch_op.drop_index('ix_chore_rotation_user_id')
+
+    op.drop_table('chore_rotation')
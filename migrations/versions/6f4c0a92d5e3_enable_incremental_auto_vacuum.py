@@ -0,0 +1,33 @@
+"""enable incremental auto_vacuum
+
+Revision ID: 6f4c0a92d5e3
+Revises: 2b6e8d31f947
+Create Date: 2026-10-17 19:20:51.733018
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '6f4c0a92d5e3'
+down_revision = '2b6e8d31f947'
+branch_labels = None
+depends_on = None
+
+
+def _set_auto_vacuum(mode):
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # switching an existing file needs a full VACUUM, which SQLite refuses
+    # inside a transaction
+    with op.get_context().autocommit_block():
+        op.execute(f'PRAGMA auto_vacuum={mode}')
+        op.execute('VACUUM')
+
+
+def upgrade():
+    _set_auto_vacuum('INCREMENTAL')
+
+
+def downgrade():
+    _set_auto_vacuum('NONE')
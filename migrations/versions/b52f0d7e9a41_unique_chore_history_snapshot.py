@@ -0,0 +1,32 @@
+"""unique chore_history (chore_id, date)
+
+Revision ID: b52f0d7e9a41
+Revises: 8f1e6b24c3d9
+Create Date: 2026-10-17 11:26:05.930127
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b52f0d7e9a41'
+down_revision = '8f1e6b24c3d9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # keep the newest row of any duplicate snapshot left by old re-runs
+    op.execute(
+        "DELETE FROM chore_history WHERE id NOT IN ("
+        "SELECT MAX(id) FROM chore_history GROUP BY chore_id, date)"
+    )
+    with op.batch_alter_table('chore_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_chore_history_chore_id_date')
+        batch_op.create_index('uq_chore_history_chore_id_date', ['chore_id', 'date'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('chore_history', schema=None) as batch_op:
+        batch_op.drop_index('uq_chore_history_chore_id_date')
+        batch_op.create_index('ix_chore_history_chore_id_date', ['chore_id', 'date'], unique=False)
@@ -0,0 +1,104 @@
+// static/confetti.js – the one confetti burst the board shows
+//
+// scripts.js loads this lazily and calls
+//   confetti({ particleCount, spread, origin: { x, y } })
+// (spread in degrees, origin as fractions of the viewport), the subset of
+// the canvas-confetti API we used.  Returns a promise that settles when
+// the burst has fallen out of view.  Nothing is drawn for visitors who
+// ask for reduced motion.
+(function () {
+    "use strict";
+
+    const COLORS = ["#26ccff", "#a25afd", "#ff5e7e", "#88ff5a", "#fcff42", "#ffa62d", "#ff36ff"];
+    const GRAVITY = 0.35;
+    const DRAG = 0.985;
+    const TICKS = 200;
+
+    let canvas = null;
+    let particles = [];
+    let frame = null;
+    let waiting = [];
+
+    function ensureCanvas() {
+        if (!canvas) {
+            canvas = document.createElement("canvas");
+            canvas.setAttribute("aria-hidden", "true");
+            Object.assign(canvas.style, {
+                position: "fixed", inset: "0", width: "100%", height: "100%",
+                pointerEvents: "none", zIndex: "1000",
+            });
+            document.body.appendChild(canvas);
+        }
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = window.innerWidth * ratio;
+        canvas.height = window.innerHeight * ratio;
+        const ctx = canvas.getContext("2d");
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        return ctx;
+    }
+
+    function step(ctx) {
+        ctx.clearRect(0, 0, window.innerWidth, window.innerHeight);
+        particles = particles.filter(p => p.tick < TICKS && p.y < window.innerHeight + 20);
+        for (const p of particles) {
+            p.tick += 1;
+            p.vx *= DRAG;
+            p.vy = p.vy * DRAG + GRAVITY;
+            p.x += p.vx + Math.sin(p.wobble) * 0.6;
+            p.y += p.vy;
+            p.wobble += p.wobbleSpeed;
+            p.tilt += p.tiltSpeed;
+            ctx.globalAlpha = 1 - p.tick / TICKS;
+            ctx.fillStyle = p.color;
+            ctx.save();
+            ctx.translate(p.x, p.y);
+            ctx.rotate(p.tilt);
+            ctx.fillRect(-p.size / 2, -p.size / 4, p.size, p.size / 2 * Math.abs(Math.cos(p.wobble)) + 1);
+            ctx.restore();
+        }
+        if (particles.length) {
+            frame = requestAnimationFrame(() => step(ctx));
+        } else {
+            frame = null;
+            canvas.remove();
+            canvas = null;
+            waiting.forEach(resolve => resolve());
+            waiting = [];
+        }
+    }
+
+    function confetti(options = {}) {
+        if (window.matchMedia && window.matchMedia("(prefers-reduced-motion: reduce)").matches) {
+            return Promise.resolve();
+        }
+        const count = options.particleCount ?? 50;
+        const spread = (options.spread ?? 45) * Math.PI / 180;
+        const origin = { x: 0.5, y: 0.5, ...options.origin };
+        const ctx = ensureCanvas();
+        const x = origin.x * window.innerWidth;
+        const y = origin.y * window.innerHeight;
+
+        for (let i = 0; i < count; i++) {
+            // straight up, fanned out over `spread`
+            const angle = -Math.PI / 2 + (Math.random() - 0.5) * spread;
+            const speed = 8 + Math.random() * 8;
+            particles.push({
+                x, y,
+                vx: Math.cos(angle) * speed,
+                vy: Math.sin(angle) * speed,
+                size: 6 + Math.random() * 6,
+                color: COLORS[i % COLORS.length],
+                tilt: Math.random() * Math.PI,
+                tiltSpeed: (Math.random() - 0.5) * 0.3,
+                wobble: Math.random() * 10,
+                wobbleSpeed: 0.05 + Math.random() * 0.1,
+                tick: Math.floor(Math.random() * 20),
+            });
+        }
+        const done = new Promise(resolve => waiting.push(resolve));
+        if (frame === null) frame = requestAnimationFrame(() => step(ctx));
+        return done;
+    }
+
+    window.confetti = confetti;
+})();
@@ -4,6 +4,8 @@ document.addEventListener("DOMContentLoaded", function () {
     let currentFilter = "all";
     let dayView = "all";
     let allUsers = []; // cache for dropdowns
+    let boardChores = []; // last known board, patched in place by the live feed
+    let groceryItems = [];
 
     const DAYS = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"];
     function getTodayName() {
@@ -82,7 +84,7 @@ document.addEventListener("DOMContentLoaded", function () {
             const btn = document.createElement("button");
             btn.textContent = label;
             btn.className = "filter-btn" + (currentFilter === value ? " active" : "");
-            btn.onclick = () => { currentFilter = value; loadChores(); };
+            btn.onclick = () => { currentFilter = value; renderBoard(); };
             userRow.appendChild(btn);
         };
 
@@ -92,13 +94,13 @@ document.addEventListener("DOMContentLoaded", function () {
         const allDaysBtn = document.createElement("button");
         allDaysBtn.textContent = "All Days";
         allDaysBtn.className = "filter-btn" + (dayView === "all" ? " active" : "");
-        allDaysBtn.onclick = () => { dayView = "all"; loadChores(); };
+        allDaysBtn.onclick = () => { dayView = "all"; renderBoard(); };
         dayRow.appendChild(allDaysBtn);
 
         const todayBtn = document.createElement("button");
         todayBtn.textContent = `Today (${getTodayName()})`;
         todayBtn.className = "filter-btn" + (dayView === "today" ? " active" : "");
-        todayBtn.onclick = () => { dayView = "today"; loadChores(); };
+        todayBtn.onclick = () => { dayView = "today"; renderBoard(); };
         dayRow.appendChild(todayBtn);
     }
 
@@ -146,8 +148,7 @@ document.addEventListener("DOMContentLoaded", function () {
         .then(res => res.json())
         .then(() => {
             document.getElementById('username-input').value = '';
-            refreshUserDropdowns();
-            loadChores();
+            if (!liveFeedOpen()) refreshUserDropdowns();
         });
     });
 
@@ -175,32 +176,38 @@ document.addEventListener("DOMContentLoaded", function () {
                 description, user_id: userId, day,
                 rotation_type: rotation, rotation_order: rotationOrder
             })
-        }).then(() => loadChores());
+        }).then(() => afterBoardWrite());
     });
 
     // ==================== Load & render chores ====================
     function loadChores() {
-        fetch("/chores")
+        // revalidate with If-None-Match; an unchanged board comes back as a 304
+        fetch("/chores", { cache: "no-cache" })
             .then(res => res.json())
             .then(chores => {
-                const grouped = groupChoresByUser(chores);
-                const usersWithChores = Object.entries(grouped).map(([userId, userChores]) => ({
-                    id: userId,
-                    name: userChores[0]?.username || "Unknown",
-                    chores: userChores.map(chore => ({
-                        id: chore.id,
-                        description: chore.description,
-                        day: chore.day,
-                        status: chore.completed ? "Completed" : "Incomplete",
-                        rotation: chore.rotation_type,
-                        rotation_order: chore.rotation_order
-                    }))
-                }));
-                renderUserChores(usersWithChores);
-                renderFilterBar(usersWithChores);
+                boardChores = chores;
+                renderBoard();
             });
     }
 
+    function renderBoard() {
+        const grouped = groupChoresByUser(boardChores);
+        const usersWithChores = Object.entries(grouped).map(([userId, userChores]) => ({
+            id: userId,
+            name: userChores[0]?.username || "Unknown",
+            chores: userChores.map(chore => ({
+                id: chore.id,
+                description: chore.description,
+                day: chore.day,
+                status: chore.completed ? "Completed" : "Incomplete",
+                rotation: chore.rotation_type,
+                rotation_order: chore.rotation_order
+            }))
+        }));
+        renderUserChores(usersWithChores);
+        renderFilterBar(usersWithChores);
+    }
+
     function groupChoresByUser(chores) {
         return chores.reduce((acc, chore) => {
             if (!acc[chore.user_id]) acc[chore.user_id] = [];
@@ -347,8 +354,8 @@ document.addEventListener("DOMContentLoaded", function () {
                         return res.json();
                     })
                     .then(() => {
-                        // Reload to get fresh state (progress bars, etc.)
-                        loadChores();
+                        // Fresh state (progress bars, etc.) arrives as a chore.moved event
+                        afterBoardWrite();
                     })
                     .catch(() => {
                         // Revert on failure
@@ -364,27 +371,32 @@ document.addEventListener("DOMContentLoaded", function () {
         fetch("/grocery")
             .then(res => res.json())
             .then(items => {
-                const list = document.getElementById("grocery-list");
-                list.innerHTML = "";
-                if (items.length === 0) {
-                    list.innerHTML = '<li class="grocery-empty">No items yet. Add something!</li>';
-                    return;
-                }
-                items.forEach(item => {
-                    const li = document.createElement("li");
-                    li.className = "grocery-item";
-                    li.innerHTML = `
-                        <div>
-                            <span class="grocery-item-name">${item.item_name}</span>
-                            <span class="grocery-item-by">by ${item.added_by}</span>
-                        </div>
-                        <button class="grocery-item-delete" onclick="deleteGroceryItem(${item.id})">Remove</button>
-                    `;
-                    list.appendChild(li);
-                });
+                groceryItems = items;
+                renderGrocery();
             });
     }
 
+    function renderGrocery() {
+        const list = document.getElementById("grocery-list");
+        list.innerHTML = "";
+        if (groceryItems.length === 0) {
+            list.innerHTML = '<li class="grocery-empty">No items yet. Add something!</li>';
+            return;
+        }
+        groceryItems.forEach(item => {
+            const li = document.createElement("li");
+            li.className = "grocery-item";
+            li.innerHTML = `
+                <div>
+                    <span class="grocery-item-name">${item.item_name}</span>
+                    <span class="grocery-item-by">by ${item.added_by}</span>
+                </div>
+                <button class="grocery-item-delete" onclick="deleteGroceryItem(${item.id})">Remove</button>
+            `;
+            list.appendChild(li);
+        });
+    }
+
     // Add grocery item
     document.getElementById("grocery-add-btn").addEventListener("click", () => {
         const input = document.getElementById("grocery-input");
@@ -401,7 +413,7 @@ document.addEventListener("DOMContentLoaded", function () {
         }).then(res => {
             if (res.ok) {
                 input.value = "";
-                loadGrocery();
+                afterGroceryWrite();
             }
         });
     });
@@ -428,7 +440,7 @@ document.addEventListener("DOMContentLoaded", function () {
         .then(res => res.json())
         .then(data => {
             alert(data.message || data.error);
-            loadGrocery();
+            afterGroceryWrite();
         });
     });
 
@@ -436,7 +448,7 @@ document.addEventListener("DOMContentLoaded", function () {
     document.getElementById("grocery-clear-btn").addEventListener("click", () => {
         if (!confirm("Clear the entire grocery list?")) return;
         fetch("/grocery/clear", { method: "DELETE" })
-            .then(() => loadGrocery());
+            .then(() => afterGroceryWrite());
     });
 
     // ==================== Delete user handler (delegated) ====================
@@ -447,23 +459,86 @@ document.addEventListener("DOMContentLoaded", function () {
             if (!confirm("Delete this user and all their chores?")) return;
             fetch(`/users/${userId}`, { method: "DELETE" })
                 .then(() => {
-                    refreshUserDropdowns();
-                    loadChores();
+                    if (!liveFeedOpen()) {
+                        refreshUserDropdowns();
+                        loadChores();
+                    }
                 });
         }
     });
 
+    // ==================== Live change feed ====================
+    // Every write on any tablet comes back over /events as a small delta.
+    // EventSource reconnects by itself and resumes via Last-Event-ID.
+    let liveFeed = null;
+
+    function liveFeedOpen() {
+        return liveFeed !== null && liveFeed.readyState === EventSource.OPEN;
+    }
+
+    // Our own writes arrive through the feed too; only re-fetch when it is down.
+    function afterBoardWrite() {
+        if (!liveFeedOpen()) loadChores();
+    }
+
+    function afterGroceryWrite() {
+        if (!liveFeedOpen()) loadGrocery();
+    }
+
+    function upsertById(list, row) {
+        const i = list.findIndex(x => x.id === row.id);
+        if (i >= 0) list[i] = row; else list.push(row);
+    }
+
+    function connectLiveFeed() {
+        if (!window.EventSource) return;
+        liveFeed = new EventSource("/events");
+        const on = (kind, fn) => liveFeed.addEventListener(kind, e => fn(JSON.parse(e.data)));
+
+        // fresh stream, or our resume point was pruned: start from a full load
+        on("ready", () => { loadChores(); loadGrocery(); });
+        on("reset", () => { refreshUserDropdowns(); loadChores(); loadGrocery(); });
+
+        const choreChanged = chore => { upsertById(boardChores, chore); renderBoard(); };
+        on("chore.created", choreChanged);
+        on("chore.updated", choreChanged);
+        on("chore.moved", choreChanged);
+        on("chore.toggled", ({ id, completed }) => {
+            const chore = boardChores.find(c => c.id === id);
+            if (chore) chore.completed = completed;
+            renderBoard();
+        });
+        on("chore.deleted", ({ id }) => {
+            boardChores = boardChores.filter(c => c.id !== id);
+            renderBoard();
+        });
+        on("week.reset", () => loadChores());
+
+        on("user.created", () => refreshUserDropdowns());
+        on("user.deleted", () => { refreshUserDropdowns(); loadChores(); });
+
+        on("grocery.added", item => { upsertById(groceryItems, item); renderGrocery(); });
+        on("grocery.removed", ({ id }) => {
+            groceryItems = groceryItems.filter(i => i.id !== id);
+            renderGrocery();
+        });
+        on("grocery.cleared", () => { groceryItems = []; renderGrocery(); });
+    }
+
     // ==================== Initial load ====================
     loadChores();
+    connectLiveFeed();
 
     document.getElementById('reset-week-btn').addEventListener('click', () => {
         if (!confirm("Archive this week and rotate chores?")) return;
         fetch('/chores/reset', { method: 'POST' })
-            .then(res => res.ok && loadChores());
+            .then(res => res.ok && afterBoardWrite());
     });
 
-    // Expose loadChores globally for toggleCompleted callback
+    // Expose helpers globally for the onclick handlers below
     window.loadChores = loadChores;
+    window.afterBoardWrite = afterBoardWrite;
+    window.afterGroceryWrite = afterGroceryWrite;
 });
 
 // ==================== Global helpers ====================
@@ -479,81 +554,76 @@ function editChore(id) {
             method: 'PUT',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ description: newDesc })
-        }).then(() => window.loadChores());
+        }).then(() => window.afterBoardWrite());
     }
 }
 
 function deleteGroceryItem(id) {
     fetch(`/grocery/${id}`, { method: 'DELETE' })
-        .then(() => {
-            // Reload grocery list
-            const list = document.getElementById("grocery-list");
-            fetch("/grocery").then(r => r.json()).then(items => {
-                list.innerHTML = "";
-                if (items.length === 0) {
-                    list.innerHTML = '<li class="grocery-empty">No items yet. Add something!</li>';
-                    return;
-                }
-                items.forEach(item => {
-                    const li = document.createElement("li");
-                    li.className = "grocery-item";
-                    li.innerHTML = `
-                        <div>
-                            <span class="grocery-item-name">${item.item_name}</span>
-                            <span class="grocery-item-by">by ${item.added_by}</span>
-                        </div>
-                        <button class="grocery-item-delete" onclick="deleteGroceryItem(${item.id})">Remove</button>
-                    `;
-                    list.appendChild(li);
-                });
-            });
+        .then(() => window.afterGroceryWrite());
+}
+
+// confetti.js is only fetched once somebody completes a chore
+let confettiLoading = null;
+function loadConfetti() {
+    if (window.confetti) return Promise.resolve(window.confetti);
+    if (!confettiLoading) {
+        confettiLoading = new Promise((resolve, reject) => {
+            const script = document.createElement("script");
+            script.src = document.body.dataset.confettiSrc;
+            script.async = true;
+            script.onload = () => resolve(window.confetti);
+            script.onerror = () => {
+                confettiLoading = null; // try again on the next completion
+                reject(new Error("confetti failed to load"));
+            };
+            document.head.appendChild(script);
         });
+    }
+    return confettiLoading;
 }
 
 function toggleCompleted(id) {
-    fetch(`/chores/${id}`)
+    // the server flips the flag atomically and answers with the new state
+    fetch(`/chores/${id}/toggle`, { method: 'POST' })
         .then(res => res.json())
         .then(chore => {
-            fetch(`/chores/${id}`, {
-                method: 'PUT',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ completed: !chore.completed })
-            }).then(() => {
-                const card = document.querySelector(`[data-id='${id}']`);
-                if (card) {
-                    const statusElement = card.querySelector(".chore-status");
-                    const buttonElement = card.querySelector(".primary-btn");
-                    const checkIcon = card.querySelector(".check-icon");
-
-                    if (!chore.completed) {
-                        card.classList.add("completed","pop-big");
-                        if (statusElement) statusElement.innerHTML = '<span class="check-icon done">&#10003;</span> Completed';
-                        if (buttonElement) {
-                            buttonElement.innerText = "Undo";
-                            buttonElement.classList.add("undo-btn");
-                        }
-                    } else {
-                        card.classList.remove("completed");
-                        card.classList.add("pop-small");
-                        if (statusElement) statusElement.innerHTML = '<span class="check-icon pending"></span> Incomplete';
-                        if (buttonElement) {
-                            buttonElement.innerText = "Done!";
-                            buttonElement.classList.remove("undo-btn");
-                        }
+            const card = document.querySelector(`[data-id='${id}']`);
+            if (card) {
+                const statusElement = card.querySelector(".chore-status");
+                const buttonElement = card.querySelector(".primary-btn");
+
+                if (chore.completed) {
+                    card.classList.add("completed","pop-big");
+                    if (statusElement) statusElement.innerHTML = '<span class="check-icon done">&#10003;</span> Completed';
+                    if (buttonElement) {
+                        buttonElement.innerText = "Undo";
+                        buttonElement.classList.add("undo-btn");
                     }
+                } else {
+                    card.classList.remove("completed");
+                    card.classList.add("pop-small");
+                    if (statusElement) statusElement.innerHTML = '<span class="check-icon pending"></span> Incomplete';
+                    if (buttonElement) {
+                        buttonElement.innerText = "Done!";
+                        buttonElement.classList.remove("undo-btn");
+                    }
+                }
 
-                    setTimeout(() => card.classList.remove("pop-big","pop-small"), 250);
+                setTimeout(() => card.classList.remove("pop-big","pop-small"), 250);
 
-                    const userSection = card.closest(".user-section");
-                    const stillIncomplete = userSection.querySelectorAll(".chore-item:not(.completed)").length;
+                const userSection = card.closest(".user-section");
+                const stillIncomplete = userSection.querySelectorAll(".chore-item:not(.completed)").length;
 
-                    if (stillIncomplete === 0 && !chore.completed) {
-                        confetti({ spread: 70, particleCount: 120, origin: { y: 0.3 } });
-                        window.allowCheer = true;
-                        window.safePlayCheer();
-                    }
+                if (chore.completed) loadConfetti().catch(() => {});
+                if (stillIncomplete === 0 && chore.completed) {
+                    loadConfetti()
+                        .then(confetti => confetti({ spread: 70, particleCount: 120, origin: { y: 0.3 } }))
+                        .catch(() => {});
+                    window.allowCheer = true;
+                    window.safePlayCheer();
                 }
-                if (window.loadChores) window.loadChores();
-            });
+            }
+            if (window.afterBoardWrite) window.afterBoardWrite();
         });
 }
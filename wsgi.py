@@ -0,0 +1,7 @@
+# wsgi.py  – production entry point: gunicorn -c gunicorn.conf.py
+"""WSGI module for multi-worker servers (``wsgi:app``)."""
+from familyhub import create_app, start
+from familyhub.config import load_env
+
+load_env()
+app = start(create_app())